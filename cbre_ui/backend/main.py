@@ -2,12 +2,15 @@ from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import asyncio
-import subprocess
 import os
 import sys
 import json
 import logging
-from typing import Optional, List
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Set
 from dotenv import load_dotenv
 
 # Setup logging
@@ -37,18 +40,27 @@ app.add_middleware(
 
 @app.middleware("http")
 async def log_requests(request, call_next):
-    logger.info(f"Incoming request: {request.method} {request.url}")
+    logger.info("Incoming request: %s %s", request.method, request.url)
     try:
         response = await call_next(request)
-        logger.info(f"Response status: {response.status_code}")
+        logger.info("Response status: %s", response.status_code)
         return response
     except Exception as e:
-        logger.error(f"Request failed: {request.method} {request.url} - Error: {e}")
+        logger.error("Request failed: %s %s - Error: %s", request.method, request.url, e)
         raise e
 
 # Global state for the scraper process
-scraper_process: Optional[subprocess.Popen] = None
-active_websockets: List[WebSocket] = []
+scraper_process: Optional[asyncio.subprocess.Process] = None
+active_websockets: Set[WebSocket] = set()
+
+# Environment snapshot for scraper subprocesses (taken after load_dotenv)
+BASE_ENV = dict(os.environ)
+
+# Scraper stdout streaming: read size per chunk and idle delay before collapsed repeats are flushed
+LOG_READ_CHUNK = 65536
+LOG_FLUSH_INTERVAL = 0.02  # seconds
+LOG_REPEAT_INTERVAL = 0.2  # seconds between "(×N)" summaries for a repeating line
+LOG_QUEUE_SIZE = 1000  # max lines waiting for broadcast; oldest are dropped beyond this
 
 class ScrapeRequest(BaseModel):
     url: str
@@ -68,36 +80,137 @@ async def root():
 @app.websocket("/ws/logs")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    active_websockets.append(websocket)
+    active_websockets.add(websocket)
     await websocket.send_text("📡 System: Log stream connected. Ready for next scrape.")
     try:
         while True:
             # Keep connection alive
             await websocket.receive_text()
     except Exception:
-        if websocket in active_websockets:
-            active_websockets.remove(websocket)
+        active_websockets.discard(websocket)
 
 async def broadcast_log(message: str):
-    for ws in active_websockets:
-        try:
-            await ws.send_text(message)
-        except:
-            pass
+    # Fan out to all clients at once so one slow socket can't stall the rest
+    clients = list(active_websockets)
+    if not clients:
+        return
+    # Encode once and send the same binary frame to everyone
+    data = message.encode('utf-8')
+    results = await asyncio.gather(
+        *(ws.send_bytes(data) for ws in clients),
+        return_exceptions=True
+    )
+    # Reap clients whose send failed (closed/broken connections)
+    failed = {ws for ws, result in zip(clients, results) if isinstance(result, Exception)}
+    if failed:
+        active_websockets.difference_update(failed)
+
+async def broadcast_log_many(lines: List[str]):
+    """Broadcasts a batch of log lines as a single newline-joined frame."""
+    if lines:
+        await broadcast_log("\n".join(lines))
+
+class ScraperLogBuffer:
+    """
+    Collects decoded scraper output lines for batched broadcast.
+    Consecutive identical lines are collapsed into a single "<line> (×N)" entry,
+    emitted at most every LOG_REPEAT_INTERVAL while the repetition lasts.
+    """
+    def __init__(self):
+        self.pending: List[str] = []
+        self.last_line = None
+        self.repeat_count = 0
+        self.repeat_flushed_at = time.monotonic()
+
+    def add(self, line: bytes):
+        decoded_line = line.decode(errors="replace").strip()
+        if not decoded_line:
+            return
+        print(f"Scraper: {decoded_line}")
+
+        if decoded_line == self.last_line:
+            self.repeat_count += 1
+            return
+
+        self._flush_repeats()
+        self.last_line = decoded_line
+        self.pending.append(decoded_line)
+
+        # Special Formatting for final property data
+        if "--- DATA EXTRACTED ---" in decoded_line or "Extracted:" in decoded_line:
+            self.pending.append("📊 [DATA SUMMARY] --------------------")
+
+    def _flush_repeats(self):
+        if self.repeat_count:
+            self.pending.append(f"{self.last_line} (×{self.repeat_count})")
+            self.repeat_count = 0
+        self.repeat_flushed_at = time.monotonic()
+
+    def drain(self, final=False) -> List[str]:
+        """Returns and clears the pending lines; repeats are flushed if due (or on final)."""
+        if self.repeat_count and (final or time.monotonic() - self.repeat_flushed_at >= LOG_REPEAT_INTERVAL):
+            self._flush_repeats()
+        lines, self.pending = self.pending, []
+        return lines
+
+def enqueue_logs(log_queue: asyncio.Queue, lines):
+    """Queues log lines, dropping the oldest queued line whenever the queue is full."""
+    for line in lines:
+        if log_queue.full():
+            log_queue.get_nowait()
+        log_queue.put_nowait(line)
+
+async def pump_scraper_output(stream: asyncio.StreamReader, log_queue: asyncio.Queue):
+    """Producer: reads scraper output in chunks, splits lines ourselves and queues them. Ends with a None sentinel."""
+    buffer = bytearray()
+    log_buffer = ScraperLogBuffer()
+    try:
+        while True:
+            try:
+                chunk = await asyncio.wait_for(stream.read(LOG_READ_CHUNK), timeout=LOG_FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                # Output went quiet: release any collapsed repeats that are due
+                enqueue_logs(log_queue, log_buffer.drain())
+                continue
+            if not chunk:
+                break
+
+            buffer.extend(chunk)
+            *lines, rest = buffer.split(b"\n")
+            buffer = bytearray(rest)
+            for line in lines:
+                log_buffer.add(line)
+            enqueue_logs(log_queue, log_buffer.drain())
+
+        # Trailing line without a newline
+        if buffer:
+            log_buffer.add(bytes(buffer))
+        enqueue_logs(log_queue, log_buffer.drain(final=True))
+    finally:
+        enqueue_logs(log_queue, [None])
+
+async def broadcast_scraper_output(log_queue: asyncio.Queue):
+    """Consumer: broadcasts everything queued since the last send as one batch, until the sentinel."""
+    while True:
+        lines = [await log_queue.get()]
+        while not log_queue.empty():
+            lines.append(log_queue.get_nowait())
+        done = lines[-1] is None
+        await broadcast_log_many([line for line in lines if line is not None])
+        if done:
+            return
 
 async def run_scraper_subprocess(req: ScrapeRequest):
     global scraper_process
     
-    # Construct environment variables
-    env = os.environ.copy()
-    if req.pinecone_api_key:
-        env['PINECONE_API_KEY'] = req.pinecone_api_key
-    if req.pinecone_env:
-        env['PINECONE_ENV'] = req.pinecone_env
-    if req.pinecone_index:
-        env['PINECONE_INDEX'] = req.pinecone_index
-    if req.openai_api_key:
-        env['OPENAI_API_KEY'] = req.openai_api_key
+    # Construct environment variables (request keys override the base snapshot)
+    overrides = {
+        'PINECONE_API_KEY': req.pinecone_api_key,
+        'PINECONE_ENV': req.pinecone_env,
+        'PINECONE_INDEX': req.pinecone_index,
+        'OPENAI_API_KEY': req.openai_api_key,
+    }
+    env = {**BASE_ENV, **{k: v for k, v in overrides.items() if v}}
     
     # Path to the script we want to run
     script_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../run_pipeline.py'))
@@ -127,24 +240,19 @@ async def run_scraper_subprocess(req: ScrapeRequest):
         )
         scraper_process = process # Allow stopping it
 
-        # Stream output
-        while True:
-            line = await process.stdout.readline()
-            if not line:
-                break
-            
-            decoded_line = line.decode().strip()
-            if decoded_line:
-                # Capture and broadcast
-                await broadcast_log(decoded_line)
-                print(f"Scraper: {decoded_line}")
-                
-                # Special Formatting for final property data
-                if "--- DATA EXTRACTED ---" in decoded_line or "Extracted:" in decoded_line:
-                    await broadcast_log("📊 [DATA SUMMARY] --------------------")
+        # Drain the pipe and broadcast independently so slow clients never back up the subprocess
+        log_queue = asyncio.Queue(maxsize=LOG_QUEUE_SIZE)
+        await asyncio.gather(
+            pump_scraper_output(process.stdout, log_queue),
+            broadcast_scraper_output(log_queue)
+        )
         
         rc = await process.wait()
         await broadcast_log(f"Scraper finished with exit code {rc}")
+
+        # New records may change search results
+        if rc == 0 and not req.dry_run:
+            query_cache.clear()
         
     except Exception as e:
         await broadcast_log(f"Error running scraper: {str(e)}")
@@ -203,13 +311,104 @@ except ImportError:
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
     from crawler_app.vector_db import VectorDB
 
-# Initialize VectorDB instance for querying
-vector_db = None
-try:
-    vector_db = VectorDB()
-except Exception as e:
-    print(f"Failed to initialize VectorDB: {e}")
-    # Do not crash the app, just leave vector_db as None (endpoints will handle it)
+# VectorDB instance for querying, created on first use so the app starts serving immediately
+vector_db: Optional[VectorDB] = None
+_vdb_init_attempted = False
+_vdb_lock = asyncio.Lock()
+
+async def get_vdb() -> Optional[VectorDB]:
+    """Returns the shared VectorDB, initializing it off the event loop on first call."""
+    global vector_db, _vdb_init_attempted
+    if _vdb_init_attempted:
+        return vector_db
+    async with _vdb_lock:
+        if not _vdb_init_attempted:
+            try:
+                loop = asyncio.get_running_loop()
+                vector_db = await loop.run_in_executor(None, VectorDB)
+            except Exception as e:
+                print(f"Failed to initialize VectorDB: {e}")
+                # Do not crash the app, just leave vector_db as None (endpoints will handle it)
+            _vdb_init_attempted = True
+    return vector_db
+
+class QueryCache:
+    """
+    Thread-safe LRU cache with a TTL for vector search responses. Keys are (query, top_k, filter_type);
+    the query is compared case- and whitespace-insensitively, so "Joe Riley" and "joe  riley" share an entry.
+    """
+    def __init__(self, max_size=2000, ttl_seconds=600):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(key):
+        query, *rest = key
+        return (" ".join(query.casefold().split()), *rest)
+
+    def get(self, key):
+        key = self.normalize(key)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        key = self.normalize(key)
+        with self._lock:
+            self._data[key] = (value, time.monotonic())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0
+            }
+
+# Voice agents tend to re-ask the same questions; skip the search round-trip for repeats
+query_cache = QueryCache()
+
+def search_and_cache(query, top_k, filter_type=None):
+    """Runs vector_db.search and stores the response. Error responses are not cached."""
+    res = vector_db.search(query, top_k=top_k, filter_type=filter_type)
+    if not res.get("text", "").startswith("Error"):
+        query_cache.put((query, top_k, filter_type), res)
+    return res
+
+def cached_search(query, top_k, filter_type=None):
+    """Runs vector_db.search through the query cache."""
+    res = query_cache.get((query, top_k, filter_type))
+    if res is None:
+        res = search_and_cache(query, top_k, filter_type)
+    return res
+
+# Worker pool for fanning out batch query misses (search is blocking I/O)
+search_pool = ThreadPoolExecutor(max_workers=4)
 
 class QueryRequest(BaseModel):
     query: Optional[str] = None
@@ -219,6 +418,17 @@ class QueryRequest(BaseModel):
     class Config:
         extra = "allow"
 
+class BatchQueryItem(QueryRequest):
+    filter_type: Optional[str] = None  # 'person', 'property' or None for both
+
+class BatchQueryRequest(BaseModel):
+    queries: List[BatchQueryItem]
+
+def log_query_request(label: str, req: QueryRequest):
+    """Logs an incoming query payload; skips serializing it when INFO is disabled."""
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("%s Query received: %s", label, req.model_dump(exclude_none=True))
+
 def parse_query_request(req: QueryRequest):
     """Helper to extract query/top_k from Retell's potential 'args' wrapper."""
     actual_query = req.query
@@ -234,46 +444,88 @@ def parse_query_request(req: QueryRequest):
 @app.post("/api/query-voice")
 async def query_voice_generic(req: QueryRequest):
     """Generic query endpoint (searches all types)"""
-    logger.info(f"Voice Query received: {req.dict()}")
+    log_query_request("Voice", req)
     query, top_k = parse_query_request(req)
     
     if not query:
         logger.error("Voice Query failed: No query string provided.")
         return {"text": "I didn't receive a query to search for.", "variables": {}}
 
-    logger.info(f"Processing Generic Query: {query} (top_k={top_k})")
+    logger.info("Processing Generic Query: %s (top_k=%s)", query, top_k)
     
-    if not vector_db: 
+    if not await get_vdb():
         logger.error("Voice Query failed: Database not initialized.")
         return {"text": "Database not initialized. Please check API keys.", "variables": {}}
     
     try:
-        res = vector_db.search(query, top_k=top_k)
+        res = cached_search(query, top_k)
         return {**res, **res.get("variables", {})}
     except Exception as e:
-        logger.error(f"Voice Query error: {e}")
+        logger.error("Voice Query error: %s", e)
         return {"text": f"Error during search: {str(e)}", "variables": {}}
 
 @app.post("/api/query/people")
 async def query_people(req: QueryRequest):
     """Query specific to People"""
-    logger.info(f"People Query received: {req.dict()}")
+    log_query_request("People", req)
     query, top_k = parse_query_request(req)
 
     if not query: return {"text": "I didn't receive a query.", "variables": {}}
-    if not vector_db: return {"text": "Database not initialized.", "variables": {}}
+    if not await get_vdb(): return {"text": "Database not initialized.", "variables": {}}
     
-    res = vector_db.search(query, top_k=top_k, filter_type='person')
+    res = cached_search(query, top_k, filter_type='person')
     return {**res, **res.get("variables", {})}
 
 @app.post("/api/query/properties")
 async def query_properties(req: QueryRequest):
     """Query specific to Properties"""
-    logger.info(f"Property Query received: {req.dict()}")
+    log_query_request("Property", req)
     query, top_k = parse_query_request(req)
 
     if not query: return {"text": "I didn't receive a query.", "variables": {}}
-    if not vector_db: return {"text": "Database not initialized.", "variables": {}}
+    if not await get_vdb(): return {"text": "Database not initialized.", "variables": {}}
     
-    res = vector_db.search(query, top_k=top_k, filter_type='property')
+    res = cached_search(query, top_k, filter_type='property')
     return {**res, **res.get("variables", {})}
+
+@app.get("/api/cache-stats")
+async def cache_stats():
+    """Hit/miss counters for the query cache"""
+    return query_cache.stats()
+
+@app.post("/api/query/batch")
+async def query_batch(req: BatchQueryRequest):
+    """Runs several queries at once; cache hits are served inline, misses in parallel"""
+    logger.info("Batch Query received: %d queries", len(req.queries))
+    if not await get_vdb():
+        return {"results": [{"text": "Database not initialized.", "variables": {}} for _ in req.queries]}
+
+    results = [None] * len(req.queries)
+    misses = {}  # (query, top_k, filter_type) -> indexes waiting on it
+    for i, item in enumerate(req.queries):
+        query, top_k = parse_query_request(item)
+        if not query:
+            results[i] = {"text": "I didn't receive a query.", "variables": {}}
+            continue
+        key = (query, top_k, item.filter_type)
+        res = query_cache.get(key)
+        if res is not None:
+            results[i] = res
+        else:
+            misses.setdefault(key, []).append(i)
+
+    if misses:
+        loop = asyncio.get_running_loop()
+        keys = list(misses)
+        fetched = await asyncio.gather(
+            *(loop.run_in_executor(search_pool, search_and_cache, *key) for key in keys),
+            return_exceptions=True
+        )
+        for key, res in zip(keys, fetched):
+            if isinstance(res, Exception):
+                logger.error("Batch Query error for '%s': %s", key[0], res)
+                res = {"text": f"Error during search: {str(res)}", "variables": {}}
+            for i in misses[key]:
+                results[i] = res
+
+    return {"results": [{**res, **res.get("variables", {})} for res in results]}
@@ -27,15 +27,20 @@ export default function Home() {
 
     let ws = new WebSocket(wsUrl);
 
+    // Log broadcasts arrive as UTF-8 binary frames
+    const decoder = new TextDecoder();
+
     const setupWs = (socket: WebSocket) => {
+      socket.binaryType = "arraybuffer";
       socket.onopen = () => console.log("✅ WebSocket Connected");
       socket.onerror = (err) => console.error("❌ WebSocket Error:", err);
       socket.onclose = () => console.warn("⚠️ WebSocket Closed");
 
       socket.onmessage = (event) => {
-        const message = event.data;
+        const message: string = typeof event.data === "string" ? event.data : decoder.decode(event.data);
         console.log("📩 Log received:", message);
-        setLogs((prev) => [...prev, message]);
+        // Backend batches several log lines into one newline-joined frame
+        setLogs((prev) => [...prev, ...message.split("\n")]);
 
         if (message.includes("Scraper finished") || message.includes("Error running scraper")) {
           setIsScraping(false);
@@ -1,7 +1,31 @@
 import streamlit as st
 import pandas as pd
 from scraper import GenericCrawler
+import os
 import time
+from itertools import chain
+from urllib.parse import urlparse
+
+# Minimum seconds between repaints of the live table / progress bar
+UI_REFRESH_INTERVAL = 0.2
+
+# Number of browsers scraping profiles in parallel (default / upper bound for the sidebar slider)
+SCRAPE_WORKERS = 4
+MAX_SCRAPE_WORKERS = 8
+
+# Optional shared Chromium to attach to instead of launching one per worker,
+# e.g. chromium --remote-debugging-port=9222 with CHROMIUM_CDP_ENDPOINT=http://127.0.0.1:9222
+CDP_ENDPOINT = os.environ.get("CHROMIUM_CDP_ENDPOINT")
+
+# Default CSS selectors for known sites, keyed by domain
+SELECTOR_PRESETS = {
+    "cbre.com": {
+        "label": "CBRE",
+        "link": ".cbre-c-listCards__title-link.CoveoResultLink",
+        "phone": "a.cbre-c-contactInfo__link[aria-label='Phone']",
+        "exp": "div.cbre-c-inlineBodyCard__card",
+    },
+}
 
 st.set_page_config(page_title="Web Data Crawler", layout="wide")
 
@@ -15,23 +39,36 @@ st.sidebar.header("Configuration")
 target_url = st.sidebar.text_input("Directory URL", placeholder="https://example.com/directory")
 
 # Auto-configure for known sites
-default_link_sel = ""
-default_phone_sel = ""
-default_exp_sel = ""
+host = urlparse(target_url).netloc.lower()
+preset = next((p for domain, p in SELECTOR_PRESETS.items() if domain in host), {})
 
-if "cbre.com" in target_url:
-    st.sidebar.success("✅ CBRE Website Detected! Auto-filling selectors.")
-    default_link_sel = ".cbre-c-listCards__title-link.CoveoResultLink"
-    default_phone_sel = "a.cbre-c-contactInfo__link[aria-label='Phone']"
-    default_exp_sel = "div.cbre-c-inlineBodyCard__card"
+if preset:
+    st.sidebar.success(f"✅ {preset['label']} Website Detected! Auto-filling selectors.")
+default_link_sel = preset.get("link", "")
+default_phone_sel = preset.get("phone", "")
+default_exp_sel = preset.get("exp", "")
 
 st.sidebar.subheader("CSS Selectors")
 link_selector = st.sidebar.text_input("Profile Link Selector", value=default_link_sel, placeholder="e.g., .profile-card a")
 phone_selector = st.sidebar.text_input("Phone Number Selector", value=default_phone_sel, placeholder="e.g., .contact-info .phone")
 experience_selector = st.sidebar.text_input("Experience Selector", value=default_exp_sel, placeholder="e.g., .experience-section")
 
+@st.cache_resource
+def get_vector_db():
+    """One VectorDB (Pinecone connection, upsert queue, known-URL cache) for the whole app; it is thread-safe."""
+    from vector_db import VectorDB
+    return VectorDB()
+
+def new_crawler(headless):
+    """A crawler for one run. Playwright's sync objects are bound to the thread that created
+    them and Streamlit reruns on a new thread, so only the VectorDB is shared across runs."""
+    if CDP_ENDPOINT:
+        return GenericCrawler.attach(CDP_ENDPOINT, headless=headless, vector_db=get_vector_db())
+    return GenericCrawler(headless=headless, vector_db=get_vector_db())
+
 # Initialize crawler
 show_browser = st.sidebar.checkbox("👀 Show Browser (Watch it work)", value=True, help="Uncheck this to run faster in the background.")
+scrape_workers = st.sidebar.slider("⚡ Parallel browsers", 1, MAX_SCRAPE_WORKERS, SCRAPE_WORKERS, help="Profiles scraped at the same time. Lower this if the site starts blocking or the machine runs out of memory.")
 
 # Stop button logic
 if "stop_crawl" not in st.session_state:
@@ -49,11 +86,26 @@ if st.sidebar.button("🔄 Reset / Restart App"):
 def stop_callback():
     st.session_state.stop_crawl = True
 
+def placeholder_row(name):
+    """Fallback row for profiles without detail links."""
+    return {
+        'URL': 'No Profile Page', 
+        'First Name': name.split(" ", 1)[0] if name else "Unknown", 
+        'Last Name': name.split(" ", 1)[1] if (name and " " in name) else "",
+        'Phone': 'Visit Search Card', 
+        'Address Line': '',
+        'City': '',
+        'State': '',
+        'Zip': '',
+        'Full Address': 'No Detail Page Available',
+        'Experience': 'N/A'
+    }
+
 if st.button("Start Crawling"):
     st.session_state.stop_crawl = False # Reset stop flag
     
-    # Re-init crawler with user preference
-    crawler = GenericCrawler(headless=not show_browser)
+    # Re-init crawler with user preference (sharing the app-wide VectorDB)
+    crawler = new_crawler(not show_browser)
     
     if not target_url:
         st.error("Please enter a Directory URL.")
@@ -83,46 +135,57 @@ if st.button("Start Crawling"):
                 # Create a placeholder for the dataframe so it updates live
                 table_placeholder = st.empty()
                 results = []
+                # Rows not yet painted; appended to the table in batches instead of rebuilding it per row
+                table_df = pd.DataFrame()
+                pending_rows = []
+                last_ui = time.monotonic()
                 
-                for i, item in enumerate(links_data):
-                    # Check for stop
-                    if st.session_state.stop_crawl:
-                        st.warning("🛑 Crawl stopped by user.")
-                        break
-
-                    name = item['Name']
-                    link = item['URL']
-
-                    # Update status
-                    status_container.text(f"👉 Processing ({i+1}/{len(links_data)}): {name}")
-                    
-                    if link:
-                        # Scrape
-                        data = crawler.scrape_details(link, phone_selector, experience_selector)
+                # Parallel workers open their own browsers; a single worker keeps using the warm one
+                if scrape_workers > 1:
+                    crawler.close_browser()
+
+                # Profiles without detail links get a placeholder row; the rest are scraped in parallel
+                no_link_rows = [placeholder_row(item['Name']) for item in links_data if not item['URL']]
+                profile_urls = [item['URL'] for item in links_data if item['URL']]
+                batch = crawler.scrape_details_batch(
+                    profile_urls, phone_selector, experience_selector, concurrency=scrape_workers
+                )
+
+                try:
+                    for i, data in enumerate(chain(no_link_rows, (data for _, data in batch))):
+                        # Check for stop
+                        if st.session_state.stop_crawl:
+                            st.warning("🛑 Crawl stopped by user.")
+                            break
+
+                        # Update status
+                        name = f"{data.get('First Name', '')} {data.get('Last Name', '')}".strip()
+                        status_container.text(f"👉 Scraped ({i+1}/{len(links_data)}): {name}")
+                        
+                        results.append(data)
+                        pending_rows.append(data)
+                        
+                        # Repaint table and progress at most every UI_REFRESH_INTERVAL
+                        if time.monotonic() - last_ui >= UI_REFRESH_INTERVAL:
+                            table_df = pd.concat([table_df, pd.DataFrame(pending_rows)], ignore_index=True)
+                            pending_rows = []
+                            table_placeholder.dataframe(table_df, width="stretch")
+                            progress_bar.progress((i + 1) / len(links_data))
+                            last_ui = time.monotonic()
                     else:
-                        # Fallback for profiles without detail links
-                        data = {
-                            'URL': 'No Profile Page', 
-                            'First Name': name.split(" ", 1)[0] if name else "Unknown", 
-                            'Last Name': name.split(" ", 1)[1] if (name and " " in name) else "",
-                            'Phone': 'Visit Search Card', 
-                            'Address Line': '',
-                            'City': '',
-                            'State': '',
-                            'Zip': '',
-                            'Full Address': 'No Detail Page Available',
-                            'Experience': 'N/A'
-                        }
-                    
-                    results.append(data)
-                    
-                    # Update table immediately
-                    current_df = pd.DataFrame(results)
-                    table_placeholder.dataframe(current_df, width="stretch")
-                    
-                    progress_bar.progress((i + 1) / len(links_data))
-                else:
-                    status_container.success("🎉 Crawl Complete!")
+                        if len(results) < len(links_data):
+                            st.warning("⚠️ Scraper workers exited early.")
+                        else:
+                            status_container.success("🎉 Crawl Complete!")
+                finally:
+                    # Let workers finish their current profile and exit
+                    batch.close()
+                
+                # Paint any leftover rows
+                if pending_rows:
+                    table_df = pd.concat([table_df, pd.DataFrame(pending_rows)], ignore_index=True)
+                    table_placeholder.dataframe(table_df, width="stretch")
+                progress_bar.progress(len(results) / len(links_data))
                 
                 # Final CSV Download
                 csv = pd.DataFrame(results).to_csv(index=False).encode('utf-8')
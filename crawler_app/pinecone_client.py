@@ -0,0 +1,32 @@
+import os
+import threading
+from pinecone import Pinecone
+
+# Host of the "cbre" serverless index
+INDEX_HOST = "https://cbre-5eba2yo.svc.aped-4627-b74a.pinecone.io"
+
+_pc = None
+_index = None
+_lock = threading.Lock()
+
+def get_index():
+    """
+    Returns the process-wide Pinecone index handle, connecting on first use so every
+    VectorDB and maintenance script shares one client (and its keep-alive connections).
+    PINECONE_API_KEY must already be in the environment (callers load their .env first).
+    """
+    global _pc, _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                api_key = os.getenv("PINECONE_API_KEY")
+                if not api_key:
+                    raise ValueError("Missing PINECONE_API_KEY")
+                _pc = Pinecone(api_key=api_key)
+                _index = _pc.Index(host=INDEX_HOST)
+    return _index
+
+def get_client():
+    """Returns the shared Pinecone client (connecting via get_index() if needed)."""
+    get_index()
+    return _pc
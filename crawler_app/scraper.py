@@ -1,89 +1,1035 @@
-from playwright.sync_api import sync_playwright
-import pandas as pd
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+import atexit
+import queue
+import re
+import threading
 import time
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, fields
+from functools import lru_cache, partial
+from typing import Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
 try:
-    from crawler_app.vector_db import VectorDB
+    from bs4 import BeautifulSoup
 except ImportError:
-    # Fallback for when running as script vs module
-    from vector_db import VectorDB
+    # Static property fetch is skipped without it; every page goes through the browser
+    BeautifulSoup = None
+
+# Precompiled patterns / lookup tables for the per-record hot paths
+PHONE_CHARS = frozenset('0123456789+')
+WHITESPACE_RE = re.compile(r'\s+')
+PHONE_RE = re.compile(r'(\d{3}[-\.\s]??\d{3}[-\.\s]??\d{4})')
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+MOBILE_LABEL_RE = re.compile(r'cell|mobile|handset', re.IGNORECASE)
+
+# Requests we never need to read page data: heavy assets and trackers.
+# Stylesheets are kept because visibility checks and innerText depend on layout.
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_URL_PATTERN = re.compile(
+    r"google-analytics|googletagmanager|doubleclick|hotjar|segment\.(?:io|com)|connect\.facebook\.net|bat\.bing\.com|\.(?:png|jpe?g|gif|svg|woff2?|ttf)(?:[?#]|$)",
+    re.IGNORECASE
+)
+
+# Profile hero-name waits: first page / after a miss, and once pages are rendering quickly
+HERO_COLD_TIMEOUT_MS = 15000
+HERO_WARM_TIMEOUT_MS = 3000
+
+# How long to wait for lazily loaded cards to appear after scrolling a results page
+LAZY_LOAD_TIMEOUT_MS = 1500
+
+# Resolves true once more than `count` elements match `sel` (lazy-loaded cards arrived)
+JS_MORE_MATCHES = "([sel, count]) => document.querySelectorAll(sel).length > count"
+
+# Markers of a Cloudflare "checking your browser" interstitial
+CLOUDFLARE_PROBE = "[id*='cf-challenge'], [class*='cf-challenge'], body:has-text('Verify you are human')"
+
+# Resolves true as soon as the first result card's text differs from `prev` (watched with a
+# MutationObserver, so no polling), or false after `timeoutMs` without a change
+JS_WAIT_FIRST_CARD_CHANGE = """
+([sel, prev, timeoutMs]) => new Promise(resolve => {
+    const changed = () => {
+        const el = document.querySelector(sel);
+        return !!el && el.innerText.trim() !== prev;
+    };
+    if (changed()) return resolve(true);
+    const obs = new MutationObserver(() => {
+        if (changed()) { obs.disconnect(); clearTimeout(timer); resolve(true); }
+    });
+    const timer = setTimeout(() => { obs.disconnect(); resolve(false); }, timeoutMs);
+    obs.observe(document.body, {childList: true, subtree: true, characterData: true});
+})
+"""
+
+# Hero/office phones (first mobile / first other picked by aria-label), first email, vCard link
+_JS_CONTACT = """
+() => {
+    const res = {primary_phone: null, mobile_phone: null, all_phones: [], vcard: null, email: null};
+    const clean = (s) => s ? s.replace('tel:', '').replace('mailto:', '').trim() : "";
+    const mob = /cell|mobile|handset/i;
+    const addPhone = (label, a) => {
+        const num = clean(a.getAttribute('href'));
+        if (!/\\d/.test(num)) return;
+        res.all_phones.push(num);
+        if (mob.test(label)) {
+            if (!res.mobile_phone) res.mobile_phone = num;
+        } else if (!res.primary_phone) {
+            res.primary_phone = num;
+        }
+    };
+
+    // 1. Hero Section
+    const hero = document.querySelector('.cbre-c-personHero');
+    if (hero) {
+        hero.querySelectorAll('a[href^="tel:"]').forEach(a => {
+            addPhone(a.getAttribute('aria-label') || 'Phone', a);
+        });
+        hero.querySelectorAll('a[href^="mailto:"]').forEach(a => {
+            if(!res.email) res.email = clean(a.getAttribute('href'));
+        });
+        const vc = hero.querySelector('a[aria-label*="Contact Card"]');
+        if (vc) res.vcard = vc.href;
+    }
+
+    // 2. Office Cards
+    const office = document.querySelector('.cbre-c-inlineCards--office');
+    if (office) {
+        office.querySelectorAll('a[href^="tel:"]').forEach(a => addPhone('Office', a));
+        office.querySelectorAll('a[href^="mailto:"]').forEach(a => {
+            if(!res.email) res.email = clean(a.getAttribute('href'));
+        });
+    }
+
+    // 3. Fallback Greedy Email
+    if (!res.email) {
+        const m = document.body.innerText.match(/[\\w\\.-]+@[\\w\\.-]+\\.\\w+/);
+        if (m) res.email = m[0];
+    }
+
+    return res;
+}
+"""
+
+# "Associated Office" address card text
+_JS_ADDR = """
+() => {
+   // Target the specific office card designation
+   const officeCard = document.querySelector('.cbre-c-inlineCards--office');
+   if (officeCard) {
+       const designation = officeCard.querySelector('.cbre-c-inlineCards__personDesignation');
+       if (designation) {
+           return designation.innerText.trim();
+       }
+   }
+
+   // Fallback to searching headers if class changed
+   const headers = Array.from(document.querySelectorAll('h3.cbre-c-inlineCards__title, h2, div'));
+   const officeHeader = headers.find(h => h.innerText.includes('Associated Office'));
+   if (officeHeader) {
+       const container = officeHeader.closest('.cbre-c-inlineCards__contactCardWrapper') || 
+                         officeHeader.closest('.cbre-c-inlineCards--office');
+       if (container) {
+           const designation = container.querySelector('.cbre-c-inlineCards__personDesignation');
+           if (designation) return designation.innerText.trim();
+           return container.innerText.replace('Associated Office', '').replace('Location', '').trim();
+       }
+   }
+   return null;
+}
+"""
+
+# "Professional Experience" section text
+_JS_EXPERIENCE = """
+() => {
+    // Strategy 1: Look for "Professional Experience" header in various forms
+    const headers = Array.from(document.querySelectorAll('div.cbre-c-inlineBodyCard__title, h2, h3'));
+    const targetHeader = headers.find(h => h.innerText.trim().includes('Professional Experience'));
+
+    if (targetHeader) {
+        // Try description sibling
+        let desc = targetHeader.parentElement.querySelector('.cbre-c-inlineBodyCard__description');
+        if (desc) return desc.innerText.trim();
+
+        // Try next sibling
+        if (targetHeader.nextElementSibling) return targetHeader.nextElementSibling.innerText.trim();
+
+        // Try parent's content excluding header
+        return targetHeader.parentElement.innerText.replace(targetHeader.innerText, '').trim();
+    }
+    return null;
+}
+"""
+
+# Specialty tags + pilot keywords found in the bio, and a short bio summary
+_JS_SPECIALTIES = """
+() => {
+    const bioEl = document.querySelector('.cbre-c-inlineBodyCard__description.cbre-c-wysiwyg');
+    const bioText = bioEl ? bioEl.innerText : "";
+
+    const specs = [];
+    document.querySelectorAll('.cbre-c-inlineCards__specialtyTag, .cbre-c-cl-tag').forEach(el => {
+        specs.push(el.innerText.trim());
+    });
+
+    // Heuristic keywords for March Pilot (Case-Insensitive check)
+    const keywords = ["Industrial", "Logistics", "Kent Valley", "South Seattle", "Tenant Representation", "Landlord Representation", "Office", "Retail", "Investment Sales"];
+    const foundKeywords = keywords.filter(k => {
+        const rel = new RegExp(k, 'i');
+        return rel.test(bioText);
+    });
+
+    // Combine structured tags and bio keywords
+    const allSpecs = [...new Set([...specs, ...foundKeywords])];
+
+    // Get first paragraph / sentence for bio summary
+    const firstParagraph = bioText.split('\\n\\n')[0] || bioText.split(/[.!]/)[0];
+
+    return {
+        specialties: allSpecs.join(', '),
+        specialty_tags: allSpecs,
+        bio_summary: firstParagraph.trim()
+    };
+}
+"""
+
+# "Search Properties" listings link and the Significant Transactions rows
+# ({Name, Location, Type, Size} when the text splits evenly into 4-line rows, else the raw lines)
+_JS_PROPERTIES = """
+() => {
+    const res = {listingsUrl: null, transactions: [], debug: {}};
+
+    // 1. Get Listings URL if any
+    const links = Array.from(document.querySelectorAll('a'));
+    const listingLink = links.find(a => a.innerText.includes('Search Properties') || a.innerText.includes('View My Listings'));
+    if (listingLink) res.listingsUrl = listingLink.href;
+
+    // 2. Get Significant Transactions
+    const headers = Array.from(document.querySelectorAll('h3, h4, div.cbre-c-inlineBodyCard__title'));
+    const transHeader = headers.find(h => h.innerText.trim() === 'Significant Transactions');
+
+    if (transHeader) {
+        const container = transHeader.closest('.cbre-c-inlineBodyCard');
+        if (container) {
+            // Read the live container's innerText (detached clones lose the rendered line breaks),
+            // with the header and the title/promo cards that share the space hidden for the read
+            const junk = [transHeader, ...container.querySelectorAll('.cbre-c-inlineBodyCard__card, .cbre-c-inlineBodyCard__title')]
+                .filter(el => el === transHeader || !el.contains(transHeader));
+            const saved = junk.map(el => [el.style.getPropertyValue('display'), el.style.getPropertyPriority('display')]);
+            junk.forEach(el => el.style.setProperty('display', 'none', 'important'));
+            let text;
+            try {
+                text = container.innerText;
+            } finally {
+                junk.forEach((el, i) => el.style.setProperty('display', ...saved[i]));
+            }
+
+            const lines = [];
+            for (const raw of text.split('\n')) {
+                const t = raw.trim();
+                if (t === 'Clients Represented') break; // Next section
+                if (t) lines.push(t);
+            }
+
+            // Transactions are listed as blocks of 4 lines: Name, Location, Type, Size
+            if (lines.length && lines.length % 4 === 0) {
+                for (let i = 0; i < lines.length; i += 4) {
+                    res.transactions.push({Name: lines[i], Location: lines[i + 1], Type: lines[i + 2], Size: lines[i + 3]});
+                }
+            } else {
+                res.transactions = lines;
+            }
+        }
+    }
+
+    return res;
+}
+"""
+
+# Single-round-trip extractor for person profile pages, composed from the section
+# snippets above. Each section runs on its own so one failure doesn't lose the rest;
+# errors come back as {__error: "..."} (see js_section).
+JS_PERSON_EXTRACT = """
+(isCbre) => {
+    const run = (fn) => { try { return fn(); } catch (e) { return {__error: String(e)}; } };
+
+    const extractContact = """ + _JS_CONTACT + """;
+    const extractAddress = """ + _JS_ADDR + """;
+    const extractExperience = """ + _JS_EXPERIENCE + """;
+    const extractSpecialties = """ + _JS_SPECIALTIES + """;
+    const extractProperties = """ + _JS_PROPERTIES + """;
+
+    const nameEl = document.querySelector("h1.cbre-c-personHero__name");
+    // Title often in personHero sub-heading
+    const titleEl = document.querySelector(".cbre-c-personHero__designation") ||
+                    document.querySelector(".cbre-c-personHero__title");
+
+    return {
+        name: nameEl ? nameEl.innerText.trim() : null,
+        title: titleEl ? titleEl.innerText.trim() : null,
+        contact: run(extractContact),
+        address: isCbre ? run(extractAddress) : null,
+        experience: isCbre ? run(extractExperience) : null,
+        specialties: run(extractSpecialties),
+        properties: run(extractProperties)
+    };
+}
+"""
+
+# Reads the absolute URL + name for every matched result card (for locator.evaluate_all).
+# If `link` is empty the card itself is the link; the name comes from `name`
+# inside the card, else from the link text when the link is a child element.
+JS_HARVEST_CARDS = """
+(cards, {link, name}) => cards.map(c => {
+    const linkEl = link ? c.querySelector(link) : c;
+    const href = linkEl ? linkEl.getAttribute('href') : null;
+    let text = "";
+    if (href) {
+        if (name) {
+            const nameEl = c.querySelector(name);
+            if (nameEl) text = nameEl.innerText.trim();
+        } else if (linkEl !== c) {
+            text = linkEl.innerText.trim();
+        }
+    }
+    return {url: href ? new URL(href, document.baseURI).href : null, name: text};
+})
+"""
+
+# First brochure file link on a property page (hero pills, collateral bar, modal buttons), resolved
+# against the page URL; links back to `propertyUrl` itself and non-file links are skipped. null if none.
+JS_FIND_BROCHURE = """
+(propertyUrl) => {
+    const results = [];
+    // 1. Check all elements with data attributes commonly used for links
+    document.querySelectorAll('[data-pill-link-info], [data-url], [data-href]').forEach(el => {
+        const url = el.getAttribute('data-pill-link-info') || el.getAttribute('data-url') || el.getAttribute('data-href');
+        const label = (el.innerText + (el.getAttribute('data-pill-asset-type') || "")).toLowerCase();
+        if (url && label.includes('brochure')) results.push(url);
+    });
+
+    // 2. Check all anchors and buttons with "Brochure" text
+    document.querySelectorAll('a, button, div.cbre-c-pd-hero__button, div[class*="pill"], div.cbre-c-pd-collateralBar__pillContainer').forEach(el => {
+        if (el.innerText.toLowerCase().includes('brochure')) {
+            const href = el.href || el.getAttribute('href');
+            if (href) results.push(href);
+            else {
+                // Check children/parents for href
+                const pLink = el.closest('a');
+                if (pLink) results.push(pLink.href);
+                const cLink = el.querySelector('a');
+                if (cLink) results.push(cLink.href);
+            }
+        }
+    });
+    const stripQuery = (u) => u.split('?')[0].replace(/\\/+$/, '');
+    const currentPath = stripQuery(propertyUrl);
+    const fileHint = /\\.pdf|\\.doc|\\.zip|fileassets|resources|brochure/i;
+    for (const raw of results) {
+        if (!raw || raw.startsWith('#') || raw.includes('javascript:')) continue;
+        let url;
+        try { url = new URL(raw, location.href).href; } catch (e) { continue; }
+        if (stripQuery(url) !== currentPath && fileHint.test(url)) return url;
+    }
+    return null;
+}
+"""
+
+# Property address candidates, in order of preference, and the fallback description
+# (one union selector, shared with the static HTML path)
+PROPERTY_ADDRESS_SELECTORS = ('.cbre-c-pd-hero__address', '.cbre-c-pd-hero__sub-title', 'address', '.cbre-c-pd-description__address')
+PROPERTY_DESCRIPTION_SELECTOR = '.cbre-c-pd-overview__description, .cbre-c-pd-description, .cbre-c-pd-text-media__description, #overview'
+
+# Property Highlights/Overview sections, address, fallback description and SqFt in one pass
+JS_PROPERTY_DETAILS = """
+() => {
+    const sections = {};
+    const getCleanText = (el) => el ? el.innerText.replace(/\\s+/g, ' ').trim() : "";
+    const searchTags = ['h1', 'h2', 'h3', 'h4', 'h5', 'div.cbre-c-pd-overview__title', 'strong'];
+    // Headers inside <main> only (skips nav/footer/modals); the whole page if main has neither section
+    const main = document.querySelector('main');
+    let headers = Array.from((main || document).querySelectorAll(searchTags.join(',')));
+    if (main && !headers.some(el => /highlights|overview/i.test(el.textContent))) {
+        headers = document.querySelectorAll(searchTags.join(','));
+    }
+    for (const el of headers) {
+        const txt = el.innerText.toLowerCase();
+        // One regex pass rejects the (many) unrelated headers
+        if (!/highlights|overview/.test(txt)) continue;
+        const key = txt.includes("highlights") ? "Highlights" : "Overview";
+
+        if (!sections[key]) {
+            let content = [];
+            let runner = el.nextElementSibling;
+            if (!runner && el.parentElement) runner = el.parentElement.nextElementSibling;
+            let b = 0;
+            while (runner && b < 10) { // Check more blocks
+                if (['H1','H2','H3','H4'].includes(runner.tagName)) break;
+                const t = getCleanText(runner);
+                if (t.length > 5) { content.push(t); b++; }
+                runner = runner.nextElementSibling;
+            }
+            sections[key] = content.join('\\n');
+            if (sections['Highlights'] && sections['Overview']) break; // Both found
+        }
+    }
+
+    let addr = "";
+    const sels = [""" + ", ".join(f"'{sel}'" for sel in PROPERTY_ADDRESS_SELECTORS) + """];
+    for (const s of sels) {
+        const el = document.querySelector(s);
+        if (el && el.innerText.trim().length > 5 && el.innerText.trim().length < 200) { 
+            addr = el.innerText.trim(); 
+            break; 
+        }
+    }
+
+    // Whole-page text is only laid out if a fallback needs it, and then only once
+    let bodyText = null;
+    const getBodyText = () => (bodyText === null ? (bodyText = document.body.innerText) : bodyText);
+
+    if (!addr) {
+        // First short line with a "WA 98101"-style state + zip
+        const line = getBodyText().split('\\n').map(l => l.trim())
+            .find(l => l.length > 10 && l.length < 100 && /[A-Z]{2}\\s+\\d{5}/.test(l));
+        if (line) addr = line;
+    }
+
+    let fb = "";
+    const m = document.querySelector('""" + PROPERTY_DESCRIPTION_SELECTOR + """');
+    if (m) fb = m.innerText.trim().slice(0, 1500);
+
+    // SqFt almost always sits in the hero/overview; only scan (the first 20KB of) the page otherwise
+    let sqft = "";
+    const sqftRe = /(\\d{1,3}(?:,\\d{3})*\\s*-\\s*)?\\d{1,3}(?:,\\d{3})*\\s*SF/i;
+    const sqftBox = document.querySelector('.cbre-c-pd-hero, .cbre-c-pd-overview, #overview');
+    const sqft_match = (sqftBox && sqftBox.innerText.match(sqftRe)) || getBodyText().slice(0, 20000).match(sqftRe);
+    if (sqft_match) sqft = sqft_match[0];
+
+    return { highlights: sections['Highlights']||"", overview: sections['Overview']||"", fallback: fb, address: addr, sqft: sqft };
+}
+"""
+
+# Reads every broker card in the property contact modal in one round-trip. Queries the union of
+# `sels` once, then keeps the cards matching the most specific selector; phone labels carry the link text,
+# aria-label and parent text so Python can tell mobile numbers apart.
+JS_PROPERTY_BROKERS = """
+(sels) => {
+    const all = Array.from(document.querySelectorAll(sels.join(', ')));
+    let cards = [];
+    for (const sel of sels) {
+        cards = all.filter(el => el.matches(sel));
+        if (cards.length) break;
+    }
+    return cards.map(el => {
+        const nameEl = el.querySelector('[class*="name"]') || el.querySelector('strong, span, h4');
+        const phones = Array.from(el.querySelectorAll('a[href^="tel:"]')).map(a => {
+            const label = (a.innerText || '').toLowerCase() || a.getAttribute('aria-label') || '';
+            const parentText = a.parentElement ? a.parentElement.innerText.toLowerCase() : '';
+            return {number: a.getAttribute('href').replace('tel:', '').trim(), label: label + ' ' + parentText};
+        });
+        const emails = Array.from(el.querySelectorAll('a[href^="mailto:"]'))
+            .map(a => a.innerText.replace('mailto:', '').trim());
+        return {name: nameEl ? nameEl.innerText.trim() : null, phones: phones, emails: emails};
+    });
+}
+"""
+
+# Static contact blocks, all read in one round-trip: for each block whose raw text mentions a
+# contact/agent/broker, its innerText, its tel: links as [number, label] (label = link text or
+# aria-label) and its name element's text. The keyword check runs on textContent (no layout);
+# only matching blocks pay for innerText, which the regex fallbacks need for line breaks
+JS_STATIC_CONTACT_BLOCKS = """
+(els) => els.filter(e => /contact|agent|broker/i.test(e.textContent)).map(e => {
+    const nameEl = e.querySelector('strong, h3, h4, [class*="name"]');
+    return {
+        text: e.innerText,
+        tels: Array.from(e.querySelectorAll('a[href^="tel:"]'), a => [
+            a.getAttribute('href').replace('tel:', ''),
+            (a.innerText || '').toLowerCase() || a.getAttribute('aria-label') || ''
+        ]),
+        name: nameEl ? nameEl.innerText.trim() : null
+    };
+})
+"""
+
+# Clicks the first rendered element of the matched set; returns its index, or -1 if none is visible
+JS_CLICK_FIRST_VISIBLE = """
+(els) => {
+    const i = els.findIndex(el => el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden');
+    if (i >= 0) els[i].click();
+    return i;
+}
+"""
+
+# Text of the first h1, or null
+JS_H1_TEXT = "() => { const h = document.querySelector('h1'); return h ? h.innerText.trim() : null; }"
+
+# Predicate for page.wait_for_function: the property title h1 has real text
+JS_H1_FILLED = "() => { const h = document.querySelector('h1'); return !!h && h.innerText.trim().length > 5; }"
+
+# Broker card selectors for the property contact modal, most specific first
+BROKER_CARD_SELECTORS = ['.cbre-c-pl-contact-form__broker-content', '.cbre-c-pl-contact-form__broker', '[class*="broker"]']
+
+# Server-rendered broker cards / hero address that make the browser unnecessary for a property page
+STATIC_BROKER_SELECTOR = '.cbre-c-pl-contact-form__broker-content, .cbre-c-pl-contact-form__broker'
+STATIC_ADDRESS_SELECTOR = '.cbre-c-pd-hero__address'
+# Blocks that may hold contacts outside the modal (rendered and static paths) and the text that marks them
+STATIC_CONTACT_SELECTOR = 'div[class*="contact"], div[class*="agent"], section[class*="contact"]'
+CONTACT_KEYWORD_RE = re.compile(r'contact|agent|broker', re.IGNORECASE)
+# Contact modal markup; in server-rendered HTML it is already present, and its cards are read separately
+CONTACT_FORM_CLASS_RE = re.compile(r'cbre-c-pl-contact-form')
+# Same section headers and brochure candidates as JS_PROPERTY_DETAILS / JS_FIND_BROCHURE, for the static HTML path
+SECTION_HEADER_SELECTOR = 'h1, h2, h3, h4, h5, div.cbre-c-pd-overview__title, strong'
+SECTION_NAME_RE = re.compile(r'highlights|overview', re.IGNORECASE)
+BROCHURE_DATA_SELECTOR = '[data-pill-link-info], [data-url], [data-href]'
+BROCHURE_TEXT_SELECTOR = 'a, button, div.cbre-c-pd-hero__button, div[class*="pill"], div.cbre-c-pd-collateralBar__pillContainer'
+# Same file hint as JS_FIND_BROCHURE, for the static HTML path
+BROCHURE_FILE_RE = re.compile(r'\.pdf|\.doc|\.zip|fileassets|resources|brochure', re.IGNORECASE)
+SQFT_CONTAINER_SELECTOR = '.cbre-c-pd-hero, .cbre-c-pd-overview, #overview'
+SQFT_RE = re.compile(r'(\d{1,3}(?:,\d{3})*\s*-\s*)?\d{1,3}(?:,\d{3})*\s*SF', re.IGNORECASE)
+
+# Extractors installed once per context (add_init_script) so each call only sends a name + argument
+PAGE_EXTRACTORS = {
+    'person': JS_PERSON_EXTRACT,
+    'brochure': JS_FIND_BROCHURE,
+    'propertyBrokers': JS_PROPERTY_BROKERS,
+    'propertyDetails': JS_PROPERTY_DETAILS,
+}
+JS_EXTRACTOR_BUNDLE = "window.__cbre = {" + ",".join(
+    f"{name}: ({source.strip()})" for name, source in PAGE_EXTRACTORS.items()
+) + "};"
+# Runs an installed extractor; null means it isn't installed on this document (caller falls back)
+JS_CALL_EXTRACTOR = "([name, arg]) => { const fn = window.__cbre && window.__cbre[name]; return fn ? {value: fn(arg)} : null; }"
+
+# Coveo paging params that would pin a directory crawl to one slice of results
+PAGING_PARAMS = frozenset(('numberOfResults', 'first'))
+
+def strip_paging_params(url):
+    """
+    Removes PAGING_PARAMS from a URL's query string and its #fragment (Coveo keeps
+    its state in the hash). Other params are kept byte-for-byte, without re-encoding.
+    """
+    def keep(params):
+        return '&'.join(p for p in params.split('&') if p and p.split('=', 1)[0] not in PAGING_PARAMS)
+    parts = urlsplit(url)
+    fragment = keep(parts.fragment) if '=' in parts.fragment else parts.fragment
+    return urlunsplit(parts._replace(query=keep(parts.query), fragment=fragment))
+
+def js_section(page_data, key):
+    """Returns one section of a combined JS extraction, re-raising any error it captured."""
+    value = page_data.get(key)
+    if isinstance(value, dict) and '__error' in value:
+        raise RuntimeError(value['__error'])
+    return value
+
+# Pure, and the same raw numbers recur across a page's tel links, fallbacks and modal cards
+@lru_cache(maxsize=1024)
+def normalize_phone(phone_str):
+    """Standardizes phone numbers to E.164 and strips emojis."""
+    if not phone_str or phone_str == "Not Found":
+        return None
+    # Keep only ASCII digits and + (drops emojis, labels, punctuation) in one pass
+    digits = ''.join(c for c in phone_str if c in PHONE_CHARS)
+    
+    if not digits:
+        return None
+        
+    # Handle US missing prefix (assuming 10 digits = US)
+    # Handle cases like "tel:12061234567" or "+1206..."
+    if digits.startswith('+'):
+        return digits
+    
+    # Heuristic Fix for CBRE Typo (426 -> 425) behavior seen in Bothell listings
+    # 426 is an unassigned area code, 425 is correct for the region.
+    if digits.startswith("426"):
+        digits = "425" + digits[3:]
+    elif digits.startswith("1426"):
+         digits = "1425" + digits[4:]
+         
+    if len(digits) == 10:
+        return "+1" + digits
+    elif len(digits) == 11 and digits.startswith('1'):
+        return "+" + digits
+    elif len(digits) > 10:
+        return "+" + digits
+        
+    return "+" + digits # Fallback base format
+
+# Field names that differ from the dict keys callers (CSV/DataFrame/Pinecone) expect
+_RECORD_KEYS = {
+    'First_Name': 'First Name',
+    'Last_Name': 'Last Name',
+    'Address_Line': 'Address Line',
+    'Full_Address': 'Full Address',
+    'Property_Name': 'Property Name',
+    'Brochure_URL': 'Brochure URL',
+}
+
+@dataclass(slots=True)
+class ProfileRecord:
+    """One person profile while it's being scraped; to_dict() gives the legacy dict shape."""
+    URL: str = ''
+    First_Name: str = ''
+    Last_Name: str = ''
+    Title: str = ''
+    Email: str = ''
+    Phone: str = ''
+    Address_Line: str = ''
+    City: str = ''
+    State: str = ''
+    Zip: str = ''
+    Full_Address: str = ''
+    Experience: str = ''
+    vCardURL: str = ''
+    LinkedProperties: list = field(default_factory=list)
+    ListingsURL: str = ''
+    phone_number: Optional[str] = None
+    mobile_phoneNumber: Optional[str] = None
+    phone_numbers: list = field(default_factory=list)
+    Specialties: str = 'N/A'
+    specialty_tags: list = field(default_factory=list)
+    bio_summary: str = ''
+
+    def mark_unreachable(self):
+        """Flags every page-derived base field (everything up to ListingsURL) as skipped."""
+        for f in fields(self)[1:15]:
+            setattr(self, f.name, "SKIPPED (Unreachable)")
+
+    def to_dict(self):
+        return {_RECORD_KEYS.get(f.name, f.name): getattr(self, f.name) for f in fields(self)}
+
+@dataclass(slots=True)
+class PropertyRecord:
+    """One property page while it's being scraped; to_dict() gives the legacy dict shape."""
+    URL: str = ''
+    Property_Name: str = ''
+    Address: str = ''
+    Description: str = ''
+    Brokers: list = field(default_factory=list)
+    Brochure_URL: str = 'Not Found'
+    SqFt: str = 'N/A'
+
+    def to_dict(self):
+        return {_RECORD_KEYS.get(f.name, f.name): getattr(self, f.name) for f in fields(self)}
+
+def classify_phones(pairs):
+    """
+    Normalizes (number, label) pairs into (office_phone, mobile_phone, all_phones): the first
+    cell/mobile/handset-labelled number is the mobile, the first other number the office line.
+    """
+    clean_phones = []
+    mobile_phone = None
+    office_phone = None
+    for raw, label in pairs:
+        c = normalize_phone(raw)
+        if not c:
+            continue
+        clean_phones.append(c)
+        # Once both slots are filled the label doesn't need scanning at all
+        if not mobile_phone and MOBILE_LABEL_RE.search(label):
+            mobile_phone = c
+        elif not office_phone:
+            office_phone = c
+    return office_phone, mobile_phone, clean_phones
+
+def _parse_contact(contact_val, rec):
+    """Phones (already split into primary/mobile by the page script), email and vCard link."""
+    rec.phone_number = normalize_phone(contact_val['primary_phone'])
+    rec.mobile_phoneNumber = normalize_phone(contact_val['mobile_phone'])
+    # Full de-duplicated list, in page order
+    rec.phone_numbers = list(dict.fromkeys(p for p in map(normalize_phone, contact_val['all_phones']) if p))
+    
+    # Legacy fields for backward compat
+    rec.Phone = " | ".join(rec.phone_numbers) if rec.phone_numbers else "Not Found"
+    rec.Email = contact_val['email'] or "Not Found"
+    if contact_val['vcard']:
+        v = contact_val['vcard']
+        rec.vCardURL = f"https://www.cbre.com{v}" if v.startswith('/') else v
+    else:
+        rec.vCardURL = "Not Found"
+
+# Lines of the office card that aren't part of the address
+ADDRESS_JUNK_TERMS = frozenset((
+    "Associated Office", "Location", "Get Directions", "Contact",
+    "Find Your Perfect Space", "Search Properties", "Search Now",
+    "Find My Listings"
+))
+ADDRESS_SKIP_PREFIXES = ("View my", "+1")
+
+def _parse_address(raw_address, rec):
+    """Cleans the office card blob and splits it into street / City / State / Zip."""
+    # Drop junk labels, "View my ..." links and office phones that leaked into the card
+    clean_lines = [
+        s for s in (line.strip() for line in (raw_address or "").split('\n'))
+        if s and s not in ADDRESS_JUNK_TERMS and not s.startswith(ADDRESS_SKIP_PREFIXES)
+    ]
+
+    rec.Full_Address = "\n".join(clean_lines) if clean_lines else ""
+    
+    # Parsing City/State/Zip from LAST line of cleaned address
+    if clean_lines:
+        # Heuristic: Last line is "Seattle, WA 98101"
+        last_line = clean_lines[-1]
+        
+        # Everything before last line is street
+        # If multiple lines remain, join them
+        rec.Address_Line = ", ".join(clean_lines[:-1])
+        
+        if "," in last_line:
+            # "Seattle, WA 98101"
+            parts = last_line.rsplit(",", 1)
+            rec.City = parts[0].strip()
+            
+            state_zip = parts[1].strip()
+            # Use regex to handle multiple tabs/spaces from CBRE site
+            sz_parts = WHITESPACE_RE.split(state_zip)
+            if len(sz_parts) >= 2:
+                rec.State = sz_parts[0]
+                rec.Zip = sz_parts[1]
+            else:
+                rec.State = state_zip
+        else:
+            # Fallback
+            rec.City = last_line
+
+def _parse_experience(exp_val, rec):
+    """Professional Experience text (also the bio summary unless the specialties section has one)."""
+    rec.Experience = exp_val or "Not Found"
+    rec.bio_summary = rec.Experience[:500]
+
+def _parse_specialties(spec_res, rec):
+    """Specialty tags/keywords and the bio summary."""
+    rec.Specialties = spec_res['specialties'] or "N/A"
+    rec.specialty_tags = spec_res['specialty_tags']
+    if spec_res['bio_summary']:
+        rec.bio_summary = spec_res['bio_summary']
+
+def _parse_properties(props_val, rec):
+    """Linked properties (Significant Transactions) and the listings search URL."""
+    rec.LinkedProperties = props_val['transactions'] or []
+    rec.ListingsURL = props_val['listingsUrl']
+
+# Person-page sections parsed from JS_PERSON_EXTRACT's result, in order (experience before
+# specialties so the specialties summary can override the experience-based bio fallback)
+_FIELD_EXTRACTORS = [
+    ('contact', _parse_contact),
+    ('address', _parse_address),
+    ('experience', _parse_experience),
+    ('specialties', _parse_specialties),
+    ('properties', _parse_properties),
+]
+
+def _contact_block_brokers(blocks):
+    """
+    Broker entries from static contact blocks ({text, tels, name}, as JS_STATIC_CONTACT_BLOCKS returns
+    them): tel: links first, phone/email regexes over the block text otherwise.
+    """
+    brokers = []
+    for block in blocks:
+        raw_txt = block['text']
+        office_phone, mobile_phone, clean_phones = classify_phones(block['tels'])
+
+        # Fallback to regex if no tel links
+        if not clean_phones:
+            for r in dict.fromkeys(PHONE_RE.findall(raw_txt)):
+                c = normalize_phone(r)
+                if c: clean_phones.append(c)
+                if not office_phone: office_phone = c
+
+        emails = list(dict.fromkeys(EMAIL_RE.findall(raw_txt)))
+        if clean_phones or emails:
+            name = block['name'] if block['name'] is not None else "Contact"
+            brokers.append({
+                'Name': name,
+                'phone_number': office_phone,
+                'mobile_phoneNumber': mobile_phone,
+                'phone_numbers': clean_phones,
+                'Emails': emails
+            })
+            print(f"    - Static Agent Found: {name}")
+    return brokers
+
+def _property_description(highlights, overview, fallback):
+    """Property description: the Highlights/Overview sections, or the fallback description without them."""
+    parts = []
+    if highlights: parts.append(f"Highlights:\\n{highlights}")
+    if overview: parts.append(f"Overview:\\n{overview}")
+    if not parts and fallback: parts.append(fallback)
+    return "\\n\\n".join(parts)
+
+def _soup_contact_blocks(soup):
+    """
+    JS_STATIC_CONTACT_BLOCKS over server-rendered HTML. Blocks that are, contain or sit inside the
+    contact modal are skipped: its broker cards are read on their own, as the rendered path does.
+    """
+    blocks = []
+    for el in soup.select(STATIC_CONTACT_SELECTOR):
+        in_modal = (
+            any(CONTACT_FORM_CLASS_RE.search(c) for c in el.get('class', []))
+            or el.find(class_=CONTACT_FORM_CLASS_RE) is not None
+            or el.find_parent(class_=CONTACT_FORM_CLASS_RE) is not None
+        )
+        if in_modal or not CONTACT_KEYWORD_RE.search(el.get_text()):
+            continue
+        name_el = el.select_one('strong, h3, h4, [class*="name"]')
+        blocks.append({
+            'text': el.get_text('\n', strip=True),
+            'tels': [
+                [a['href'].replace('tel:', ''), a.get_text(strip=True).lower() or a.get('aria-label') or '']
+                for a in el.select('a[href^="tel:"]')
+            ],
+            'name': name_el.get_text(strip=True) if name_el else None
+        })
+    return blocks
+
+def _soup_sections(soup):
+    """(highlights, overview) section text, found the same way JS_PROPERTY_DETAILS does, from server-rendered HTML."""
+    main = soup.select_one('main')
+    headers = (main or soup).select(SECTION_HEADER_SELECTOR)
+    if main and not any(SECTION_NAME_RE.search(el.get_text()) for el in headers):
+        headers = soup.select(SECTION_HEADER_SELECTOR)
+    sections = {}
+    for el in headers:
+        txt = el.get_text().lower()
+        if not SECTION_NAME_RE.search(txt):
+            continue
+        key = "Highlights" if "highlights" in txt else "Overview"
+        if sections.get(key):
+            continue
+        content = []
+        runner = el.find_next_sibling()
+        if runner is None and el.parent is not None:
+            runner = el.parent.find_next_sibling()
+        while runner is not None and len(content) < 10:
+            if runner.name in ('h1', 'h2', 'h3', 'h4'):
+                break
+            t = WHITESPACE_RE.sub(' ', runner.get_text(' ')).strip()
+            if len(t) > 5:
+                content.append(t)
+            runner = runner.find_next_sibling()
+        sections[key] = '\n'.join(content)
+        if sections.get('Highlights') and sections.get('Overview'):
+            break
+    return sections.get('Highlights', ''), sections.get('Overview', '')
+
+def _soup_brochure(soup, property_url):
+    """JS_FIND_BROCHURE over server-rendered HTML: the first brochure file URL, or None."""
+    candidates = []
+    for el in soup.select(BROCHURE_DATA_SELECTOR):
+        url = el.get('data-pill-link-info') or el.get('data-url') or el.get('data-href')
+        label = (el.get_text() + (el.get('data-pill-asset-type') or "")).lower()
+        if url and 'brochure' in label:
+            candidates.append(url)
+    for el in soup.select(BROCHURE_TEXT_SELECTOR):
+        if 'brochure' not in el.get_text().lower():
+            continue
+        if el.get('href'):
+            candidates.append(el['href'])
+            continue
+        # Check parents/children for href
+        parent_link = el.find_parent('a', href=True)
+        if parent_link:
+            candidates.append(parent_link['href'])
+        child_link = el.select_one('a[href]')
+        if child_link:
+            candidates.append(child_link['href'])
+
+    current_path = property_url.split('?')[0].rstrip('/')
+    for raw in candidates:
+        if not raw or raw.startswith('#') or 'javascript:' in raw:
+            continue
+        url = urljoin(property_url, raw)
+        if url.split('?')[0].rstrip('/') != current_path and BROCHURE_FILE_RE.search(url):
+            return url
+    return None
+
+def block_nonessential_requests(route, blocked_types=BLOCKED_RESOURCE_TYPES):
+    """Route handler: aborts `blocked_types` (images/fonts/media by default) and analytics calls, lets everything else through."""
+    request = route.request
+    if request.resource_type in blocked_types or BLOCKED_URL_PATTERN.search(request.url):
+        route.abort()
+    else:
+        route.continue_()
+
+class RateLimiter:
+    """
+    Token bucket shared across threads: one token every `interval` seconds, holding up to `burst`.
+    acquire() blocks (via `sleep`) until a token is free; time spent between calls counts towards
+    the interval, so callers that are already slower than the rate never wait.
+    """
+    def __init__(self, interval, burst=1):
+        self.interval = interval
+        self.burst = burst
+        self._tat = 0.0 # Theoretical arrival time of the next call on the monotonic clock
+        self._lock = threading.Lock()
+
+    def acquire(self, sleep=time.sleep):
+        # Reserve the slot under the lock, then sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self.interval
+        wait = tat - (self.burst - 1) * self.interval - now
+        if wait > 0:
+            sleep(wait)
 
 class GenericCrawler:
-    def __init__(self, headless=False, disable_vectors=False):
+    _shared = {} # thread id -> crawler handed out by get_shared()
+    _shared_lock = threading.Lock()
+
+    def __init__(self, headless=False, disable_vectors=False, vector_db=None, block_resources=True, rotate_every=50, cdp_endpoint=None, static_fetch=True, block_stylesheets=False):
         self.headless = headless
+        self.static_fetch = static_fetch # Try a plain HTTP fetch of property pages before rendering them
+        self.cdp_endpoint = cdp_endpoint # Attach to an already running Chromium instead of launching one (see attach())
         self.disable_vectors = disable_vectors
+        self.block_resources = block_resources # Set False to load every asset (debugging)
+        # Also drop CSS: less to download and lay out, but hidden text can then leak into innerText reads
+        self.block_stylesheets = block_stylesheets
+        self.rotate_every = rotate_every # Pages per browser context before it is recycled (0 = never)
+        self._pages_since_rotate = 0
+        self._hero_timeout_ms = HERO_COLD_TIMEOUT_MS # Profile hero wait (see scrape_details)
         self.playwright = None
         self.browser = None
         self.context = None
         self.page = None
         
-        # Initialize Vector DB
-        if not self.disable_vectors:
+        # Initialize Vector DB (or share an existing connection, e.g. across worker crawlers)
+        if vector_db is not None:
+            self.vector_db = vector_db
+        elif not self.disable_vectors:
+            # Imported here so dry runs don't pay for the Pinecone client import
+            try:
+                from crawler_app.vector_db import VectorDB
+            except ImportError:
+                # Fallback for when running as script vs module
+                from vector_db import VectorDB
             self.vector_db = VectorDB()
         else:
             self.vector_db = None
             print("Vector DB disabled (Test Mode/Dry Run).")
 
+    @classmethod
+    def attach(cls, cdp_endpoint, headless=False, disable_vectors=False, **kwargs):
+        """
+        Crawler that connects to a shared Chromium over CDP (e.g. one started with
+        --remote-debugging-port=9222, endpoint "http://127.0.0.1:9222") instead of launching
+        its own. Each crawler still gets its own context, so cookies stay isolated.
+        `headless` is decided by whoever launched the shared browser.
+        """
+        return cls(headless=headless, disable_vectors=disable_vectors, cdp_endpoint=cdp_endpoint, **kwargs)
+
+    @classmethod
+    def get_shared(cls, **kwargs):
+        """
+        The calling thread's shared crawler with its browser already started, so repeated
+        callers in one process pay Chromium's cold start once. Kept per thread because
+        Playwright's sync objects only work on the thread that created them; `kwargs` only
+        apply when the instance is first created. The main thread's one is closed at interpreter
+        exit; crawlers shared on other threads must be closed by their callers (close_browser).
+        """
+        key = threading.get_ident()
+        with cls._shared_lock:
+            crawler = cls._shared.get(key)
+            if crawler is None:
+                crawler = cls._shared[key] = cls(**kwargs)
+        crawler.start_browser() # No-op while the browser is running
+        return crawler
+
+    @classmethod
+    def _close_shared(cls):
+        """
+        Closes the calling thread's shared crawler (run at exit, i.e. on the main thread).
+        Crawlers shared on other threads can't be closed from here; their callers close them.
+        """
+        with cls._shared_lock:
+            crawler = cls._shared.pop(threading.get_ident(), None)
+        if crawler is None:
+            return
+        try:
+            crawler.close_browser()
+        except Exception as e:
+            print(f"Error closing shared crawler: {e}")
+
+    def preload_known(self, namespace):
+        """Loads every URL already stored in a namespace so exists() can answer locally."""
+        if not self.vector_db:
+            return
+        count = self.vector_db.preload_urls(namespace)
+        print(f"Preloaded {count} known URLs from {namespace}.")
+
     def exists(self, url, namespace=None):
-        """Checks if a URL already exists in the vector DB by querying metadata."""
+        """Checks if a URL already exists in the vector DB (locally if the namespace was preloaded)."""
         if not self.vector_db:
             return False
         return self.vector_db.exists(url, namespace)
 
     def format_phone(self, phone_str):
-        """Standardizes phone numbers to E.164 and strips emojis."""
-        if not phone_str or phone_str == "Not Found":
-            return None
-        import re
-        # Strip ALL emojis and non-ASCII characters
-        cleaned = re.sub(r'[^\x00-\x7F]+', '', phone_str)
-        # Strip all but digits and +
-        digits = re.sub(r'[^\d+]', '', cleaned)
-        
-        if not digits:
-            return None
-            
-        # Handle US missing prefix (assuming 10 digits = US)
-        # Handle cases like "tel:12061234567" or "+1206..."
-        if digits.startswith('+'):
-            return digits
-        
-        # Heuristic Fix for CBRE Typo (426 -> 425) behavior seen in Bothell listings
-        # 426 is an unassigned area code, 425 is correct for the region.
-        if digits.startswith("426"):
-            digits = "425" + digits[3:]
-        elif digits.startswith("1426"):
-             digits = "1425" + digits[4:]
-             
-        if len(digits) == 10:
-            return "+1" + digits
-        elif len(digits) == 11 and digits.startswith('1'):
-            return "+" + digits
-        elif len(digits) > 10:
-            return "+" + digits
-            
-        return "+" + digits # Fallback base format
+        """Standardizes phone numbers to E.164 and strips emojis (see normalize_phone)."""
+        return normalize_phone(phone_str)
+
+    def _cloudflare_challenged(self):
+        """Cheap probe for a Cloudflare challenge page (one selector count instead of serializing the DOM)."""
+        try:
+            return self.page.locator(CLOUDFLARE_PROBE).count() > 0
+        except Exception:
+            return False
 
     def start_browser(self):
         """Starts the browser instance."""
         if not self.playwright:
-            print(f"Starting browser (Headless={self.headless})...")
             self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.launch(headless=self.headless)
-            # Set a standard desktop viewport to avoid mobile layouts/detection
-            self.context = self.browser.new_context(
-                viewport={'width': 1280, 'height': 800},
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-            self.page = self.context.new_page()
+            if self.cdp_endpoint:
+                print(f"Attaching to shared browser at {self.cdp_endpoint}...")
+                self.browser = self.playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+            else:
+                print(f"Starting browser (Headless={self.headless})...")
+                self.browser = self.playwright.chromium.launch(headless=self.headless)
+            self._new_context_and_page()
+
+    def _new_context_and_page(self, storage_state=None):
+        """Creates a fresh browser context + page (with request blocking) on the running browser."""
+        # Set a standard desktop viewport to avoid mobile layouts/detection
+        self.context = self.browser.new_context(
+            storage_state=storage_state,
+            viewport={'width': 1280, 'height': 800},
+            user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+        )
+        if self.block_resources:
+            # One handler per context lifetime (re-installed when the context is recycled)
+            blocked_types = BLOCKED_RESOURCE_TYPES | {"stylesheet"} if self.block_stylesheets else BLOCKED_RESOURCE_TYPES
+            self.context.route("**/*", partial(block_nonessential_requests, blocked_types=blocked_types))
+        self.context.add_init_script(JS_EXTRACTOR_BUNDLE)
+        self.page = self.context.new_page()
+        self._pages_since_rotate = 0
+
+    def _rotate_context_if_due(self):
+        """Counts a page visit; every `rotate_every` visits the context is replaced to release leaked memory."""
+        if self.rotate_every and self._pages_since_rotate >= self.rotate_every:
+            print(f"  > Recycling browser context after {self._pages_since_rotate} pages...")
+            # Carry cookies/localStorage over (e.g. Cloudflare clearance, cookie-banner consent)
+            state = self.context.storage_state()
+            self.page.close()
+            self.context.close()
+            self._new_context_and_page(storage_state=state)
+        self._pages_since_rotate += 1
+
+    def _extract(self, name, arg=None):
+        """Runs PAGE_EXTRACTORS[name] via the copy installed in the page, sending the full source only if it's missing."""
+        res = self.page.evaluate(JS_CALL_EXTRACTOR, [name, arg])
+        if res is None:
+            return self.page.evaluate(PAGE_EXTRACTORS[name], arg)
+        return res['value']
 
     def close_browser(self):
         """Closes the browser instance."""
+        if self.vector_db:
+            # Upserts are batched; make sure nothing scraped so far is left in the buffer
+            self.vector_db.flush()
         if self.page:
             self.page.close()
         if self.context:
             self.context.close()
         if self.browser:
+            # For an attached browser this only disconnects; the shared Chromium keeps running
             self.browser.close()
         if self.playwright:
             self.playwright.stop()
@@ -96,21 +1042,23 @@ class GenericCrawler:
     def get_links(self, directory_url, card_selector='.CoveoResult', link_selector='a.cbre-c-listCards__title-link', name_selector=None, limit=None):
         """
         Extracts profile information using the persistent browser with pagination logic.
-        Returns a list of dictionaries with name and profile URL.
+        Returns a list of dictionaries with name and profile URL (see iter_links).
+        """
+        return list(self.iter_links(directory_url, card_selector, link_selector, name_selector, limit))
+
+    def iter_links(self, directory_url, card_selector='.CoveoResult', link_selector='a.cbre-c-listCards__title-link', name_selector=None, limit=None):
+        """
+        Generator version of get_links: yields each {Name, URL} as soon as its directory page
+        is harvested, so consumers can start before pagination finishes. The directory stays
+        open on this crawler's page between items; scrape the yielded URLs elsewhere (e.g.
+        batch workers), not on this crawler, while iterating.
         """
-        results = []
         if not self.page:
             self.start_browser()
             
         # Clean URL to prevent pre-filtering limits
         try:
-            import re
-            clean_url = re.sub(r'([?&])numberOfResults=\d+', '', directory_url)
-            clean_url = re.sub(r'([?&])first=\d+', '', clean_url)
-            clean_url = clean_url.replace("&&", "&").replace("?&", "?")
-            if clean_url.endswith("&") or clean_url.endswith("?"):
-                clean_url = clean_url[:-1]
-             
+            clean_url = strip_paging_params(directory_url)
             print(f"Original URL: {directory_url}")
             print(f"Cleaned URL: {clean_url}")
             directory_url = clean_url
@@ -119,105 +1067,76 @@ class GenericCrawler:
 
         try:
             print(f"Navigating to {directory_url}")
-            self.page.goto(directory_url, timeout=60000)
+            # Don't wait for 'load' (trackers/beacons); the result-card wait below is the readiness signal
+            self.page.goto(directory_url, timeout=60000, wait_until='domcontentloaded')
             
-            # Wait for content
+            # Wait for content (result cards are the real readiness signal; trackers keep the network busy)
             try:
-                self.page.wait_for_load_state('networkidle', timeout=10000)
-                # Wait for result cards instead of just links
                 self.page.wait_for_selector(card_selector, timeout=10000)
             except Exception as e:
                 print(f"Warning: Timeout waiting for results. Page might still have loaded content.")
             
             # Pagination Loop
+            seen = set() # URLs already yielded
             page_num = 1
             while True:
                 print(f"  > Processing Page {page_num}...")
                 
-                # Scroll down to trigger lazy loading
-                self.page.mouse.wheel(0, 500)
-                time.sleep(0.3)
-                self.page.mouse.wheel(0, 500)
-                time.sleep(0.3)
+                # Scroll down to trigger lazy loading, then give new cards a moment to render
+                card_locator = self.page.locator(card_selector)
+                card_count = card_locator.count()
+                self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                try:
+                    self.page.wait_for_function(JS_MORE_MATCHES, arg=[card_selector, card_count], timeout=LAZY_LOAD_TIMEOUT_MS)
+                except PlaywrightTimeoutError:
+                    pass # Nothing lazy-loaded; harvest what is there
                 
-                # Harvest from current page
-                cards = self.page.query_selector_all(card_selector)
+                # Harvest from current page (one round-trip for every card's link + name)
+                cards = card_locator.evaluate_all(JS_HARVEST_CARDS, {'link': link_selector, 'name': name_selector})
                 for card in cards:
                      # Check limit inside the loop
-                    if limit and len(results) >= limit:
+                    if limit and len(seen) >= limit:
                         print(f"    Reached limit ({limit}). Stopping pagination.")
-                        return results
+                        return
 
-                    item = {'Name': '', 'URL': ''}
-                    
-                    # Try to get Link and Name
-                    # If link_selector is explicitly None or empty, assume card is the link
-                    if not link_selector:
-                        link_el = card
-                    else:
-                        link_el = card.query_selector(link_selector)
+                    # Only add if we have a URL (for properties we MUST have one; people
+                    # without profile pages are skipped, as before)
+                    if not card['url']:
+                        continue
 
-                    if link_el and link_el.get_attribute('href'):
-                        href = link_el.get_attribute('href')
-                        item['URL'] = urljoin(directory_url, href)
-                        
-                        # Name extraction
-                        if name_selector:
-                             name_el = card.query_selector(name_selector)
-                             if name_el:
-                                 item['Name'] = name_el.inner_text().strip()
-                        elif link_el != card:
-                             # Default: use link text if link is a child
-                             item['Name'] = link_el.inner_text().strip()
-                    else:
-                        # Fallback for people without profile pages (e.g. Madison Lichter)
-                        # ONLY if we are in the default 'CoveoResult' mode
-                        if card_selector == '.CoveoResult':
-                            name_el = card.query_selector('p.cbre-c-listCards__title')
-                            if name_el:
-                                item['Name'] = name_el.inner_text().strip()
-                        
-                    # Fix Name if still empty
-                    if not item['Name']:
-                         item['Name'] = "Unknown"
-
-                    # Only add if we have a URL (unless it's a person without a link, logic preserved above?)
-                    # Actually, for properties we MUST have a URL.
-                    # For people, we might capture 'Unknown' url? The original code didn't add if no URL was found (except specifically falling back).
-                    # Let's simple check:
-                    if item['URL']:
-                        # Avoid duplicates
-                        if not any(r['Name'] == item['Name'] and r['URL'] == item['URL'] for r in results):
-                            results.append(item)
+                    item = {'Name': card['name'] or "Unknown", 'URL': card['url']}
+
+                    # Avoid duplicates (overlapping pages can repeat a card, sometimes under another name)
+                    if item['URL'] not in seen:
+                        seen.add(item['URL'])
+                        yield item
                 
-                print(f"    Found {len(cards)} items on this page. Total unique: {len(results)}")
+                print(f"    Found {len(cards)} items on this page. Total unique: {len(seen)}")
                 
-                if limit and len(results) >= limit:
+                if limit and len(seen) >= limit:
                      print(f"    Reached limit ({limit}). Stopping pagination.")
                      break
 
                 # Find and Click Next Button
                 next_btn_selector = 'span[title="Next"]'
-                next_btn = self.page.query_selector(next_btn_selector)
+                # Locator, not query_selector: no ElementHandle left behind on every page turn
+                next_btn = self.page.locator(next_btn_selector).first
                 
-                if next_btn and next_btn.is_visible():
+                if next_btn.is_visible():
                     try:
                         print("    Clicking 'Next' page...")
-                        # Click the parent or use javascript to ensure it triggers
-                        self.page.evaluate('el => el.click()', next_btn)
+                        # Remember the first result so we can tell when the list re-renders
+                        first_name_before = self.page.eval_on_selector(card_selector, 'el => el.innerText.trim()') if cards else ""
                         
-                        # Wait for results to update (check first result changes)
-                        first_name_before = cards[0].inner_text().strip() if cards else ""
-                        
-                        time.sleep(2)
-                        self.page.wait_for_load_state('networkidle', timeout=5000)
+                        # Click the parent or use javascript to ensure it triggers
+                        next_btn.evaluate('el => el.click()')
                         
-                        # Verify we actually moved
-                        new_cards = self.page.query_selector_all('.CoveoResult')
-                        if new_cards and new_cards[0].inner_text().strip() == first_name_before:
+                        # Wait for results to update (first result changes); click again only if they didn't
+                        wait_args = [card_selector, first_name_before, 6000]
+                        if not self.page.evaluate(JS_WAIT_FIRST_CARD_CHANGE, wait_args):
                             print("    Wait... Page did not seem to change. Retrying click...")
-                            self.page.evaluate('el => el.click()', next_btn)
-                            time.sleep(2)
+                            next_btn.evaluate('el => el.click()')
+                            self.page.evaluate(JS_WAIT_FIRST_CARD_CHANGE, wait_args)
                         
                         page_num += 1
                         if page_num > 50: # Safety break
@@ -231,434 +1150,288 @@ class GenericCrawler:
                         
         except Exception as e:
             print(f"Error fetching directory: {e}")
-        
-        return results
 
     def scrape_details(self, profile_url, phone_selector, experience_selector):
         """
         Scrapes details from a single profile page using the persistent browser.
         """
-        data = {
-            'URL': profile_url, 
-            'First Name': '', 
-            'Last Name': '',
-            'Title': '',
-            'Email': '',
-            'Phone': '', 
-            'Address Line': '',
-            'City': '',
-            'State': '',
-            'Zip': '',
-            'Full Address': '',
-            'Experience': '',
-            'vCardURL': '',
-            'LinkedProperties': [],
-            'ListingsURL': ''
-        }
+        rec = ProfileRecord(URL=profile_url)
         # URL Normalization
         if 'test-www1.cbre.com' in profile_url:
             profile_url = profile_url.replace('test-www1.cbre.com', 'www.cbre.com')
-            data['URL'] = profile_url
+            rec.URL = profile_url
 
         print(f"  > Scraper visiting: {profile_url}")
         
         if not self.page:
             self.start_browser()
+        self._rotate_context_if_due()
             
         try:
-            # CBRE can have many background trackers, so 'load' or 'domcontentloaded' is safer than 'networkidle'
-            self.page.goto(profile_url, timeout=30000, wait_until='load')
+            # Return as soon as the response commits; the hero name below is the real readiness gate
+            # (waiting for 'load' also waits on trackers/fonts still in flight)
+            self.page.goto(profile_url, timeout=30000, wait_until='commit')
             
-            # --- Cloudflare Detection ---
-            if "Verify you are human" in self.page.content() or "cf-challenge" in self.page.content():
-                print("  !! Cloudflare Challenge Detected! Attempting to wait/solve...")
-                # Wait for the challenge to be solved manually if headless=False
-                # Or try a simple click if it's the standard checkbox
-                try:
-                    # Give it a few seconds to auto-solve or user to click
-                    time.sleep(5)
-                    # Try to find the checkbox iframe and click?
-                    # Highly variable, but let's at least wait.
-                except:
-                    pass
-
-            # Extra wait for the name since it's the hero element
+            # Extra wait for the name since it's the hero element. Once a profile has rendered the
+            # bundles are cached and later heroes show up fast, so the wait shrinks until a miss
+            hero_timeout = self._hero_timeout_ms
             try:
-                self.page.wait_for_selector("h1.cbre-c-personHero__name", timeout=15000)
+                self.page.wait_for_selector("h1.cbre-c-personHero__name", timeout=hero_timeout)
+                self._hero_timeout_ms = HERO_WARM_TIMEOUT_MS
             except:
-                if "Verify you are human" in self.page.content():
-                    print("  !! STILL BLOCKED by Cloudflare. Suggest running with 'Show Browser = True' to solve manually.")
-                pass
+                self._hero_timeout_ms = HERO_COLD_TIMEOUT_MS
+                hero_found = False
+                if hero_timeout < HERO_COLD_TIMEOUT_MS:
+                    # Missed the warm budget: give this page the rest of the cold one (same worst case as a cold wait)
+                    try:
+                        self.page.wait_for_selector("h1.cbre-c-personHero__name", timeout=HERO_COLD_TIMEOUT_MS - hero_timeout)
+                        hero_found = True
+                    except PlaywrightTimeoutError:
+                        pass
+                # --- Cloudflare Detection ---
+                if not hero_found and self._cloudflare_challenged():
+                    print("  !! Cloudflare Challenge Detected! Attempting to wait/solve...")
+                    # Give it another window to auto-solve or for the user to click (headless=False)
+                    try:
+                        self.page.wait_for_selector("h1.cbre-c-personHero__name", timeout=HERO_COLD_TIMEOUT_MS)
+                    except:
+                        if self._cloudflare_challenged():
+                            print("  !! STILL BLOCKED by Cloudflare. Suggest running with 'Show Browser = True' to solve manually.")
         except Exception as e:
             print(f"  !! SKIPPING: Could not reach {profile_url}. Error: {e}")
-            for key in data:
-                if key != 'URL':
-                    data[key] = "SKIPPED (Unreachable)"
-            return data
+            rec.mark_unreachable()
+            return rec.to_dict()
 
         try:
+            # Pull everything we need from the page in one round-trip
+            page_data = self._extract('person', 'cbre.com' in profile_url)
+
             # --- 1. Name & Title ---
             try:
-                name_el = self.page.query_selector("h1.cbre-c-personHero__name")
-                if name_el:
-                    name_val = name_el.inner_text().strip()
-                    parts = name_val.split(" ", 1)
-                    data['First Name'] = parts[0]
-                    data['Last Name'] = parts[1] if len(parts) > 1 else ""
+                name_val = page_data['name']
+                if name_val is not None:
+                    rec.First_Name, _, rec.Last_Name = name_val.partition(" ")
                 
-                # Title often in personHero sub-heading
-                title_el = self.page.query_selector(".cbre-c-personHero__designation") or \
-                           self.page.query_selector(".cbre-c-personHero__title")
-                if title_el:
-                    data['Title'] = title_el.inner_text().strip()
+                if page_data['title'] is not None:
+                    rec.Title = page_data['title']
             except Exception as e:
                  print(f"Error parsing name/title: {e}")
 
-            # --- 2. Phone, Email & vCard ---
+            # --- 2-5. Contact, Address, Experience, Specialties, Linked Properties ---
+            for key, parse in _FIELD_EXTRACTORS:
+                try:
+                    parse(js_section(page_data, key), rec)
+                except Exception as e:
+                    print(f"Error parsing {key}: {e}")
+
+        except Exception as e:
+            print(f"Error scraping {profile_url}: {e}")
+        
+        data = rec.to_dict()
+
+        # Upsert to Pinecone (buffered; sent in batches by VectorDB). A profile whose hero name never
+        # rendered is a half-loaded page: don't store it (or claim its URL), so a later run retries it
+        if not rec.First_Name:
+            print(f"  !! No name found on {profile_url}; not saving it to the vector DB.")
+        elif self.vector_db:
+            self.vector_db.upsert_person(data)
+
+        return data
+
+    def scrape_details_batch(self, profile_urls, phone_selector=None, experience_selector=None, concurrency=4, delay=0):
+        """
+        Scrapes many profiles in parallel, yielding (url, data) as each one finishes.
+        See _scrape_batch for how the workers are run.
+        """
+        def scrape(crawler, url):
             try:
-                js_contact = """
-                    () => {
-                        const res = {phone_data: [], vcard: null, email: null};
-                        const clean = (s) => s ? s.replace('tel:', '').replace('mailto:', '').trim() : "";
-
-                        // 1. Hero Section
-                        const hero = document.querySelector('.cbre-c-personHero');
-                        if (hero) {
-                            hero.querySelectorAll('a[href^="tel:"]').forEach(a => {
-                                const label = a.getAttribute('aria-label') || 'Phone';
-                                res.phone_data.push({label: label, number: clean(a.getAttribute('href'))});
-                            });
-                            hero.querySelectorAll('a[href^="mailto:"]').forEach(a => {
-                                if(!res.email) res.email = clean(a.getAttribute('href'));
-                            });
-                            const vc = hero.querySelector('a[aria-label*="Contact Card"]');
-                            if (vc) res.vcard = vc.href;
-                        }
-                        
-                        // 2. Office Cards
-                        const office = document.querySelector('.cbre-c-inlineCards--office');
-                        if (office) {
-                            office.querySelectorAll('a[href^="tel:"]').forEach(a => {
-                                res.phone_data.push({label: 'Office', number: clean(a.getAttribute('href'))});
-                            });
-                            office.querySelectorAll('a[href^="mailto:"]').forEach(a => {
-                                if(!res.email) res.email = clean(a.getAttribute('href'));
-                            });
-                        }
-                        
-                        // 3. Fallback Greedy Email
-                        if (!res.email) {
-                            const m = document.body.innerText.match(/[\\w\\.-]+@[\\w\\.-]+\\.\\w+/);
-                            if (m) res.email = m[0];
-                        }
-
-                        return res;
-                    }
-                """
-                contact_val = self.page.evaluate(js_contact)
-                
-                # Map Categorized Phones
-                data['phone_number'] = None
-                data['mobile_phoneNumber'] = None
-                data['phone_numbers'] = [] # Keep for internal list
-                
-                for p_item in contact_val['phone_data']:
-                    label = p_item['label'].lower()
-                    clean_num = self.format_phone(p_item['number'])
-                    if not clean_num: continue
-                    
-                    if clean_num not in data['phone_numbers']:
-                        data['phone_numbers'].append(clean_num)
-                    
-                    if any(k in label for k in ['cell', 'mobile', 'handset']):
-                        if not data['mobile_phoneNumber']: data['mobile_phoneNumber'] = clean_num
-                    else:
-                        if not data['phone_number']: data['phone_number'] = clean_num
-                
-                # Legacy fields for backward compat
-                data['Phone'] = " | ".join(data['phone_numbers']) if data['phone_numbers'] else "Not Found"
-                data['Email'] = contact_val['email'] or "Not Found"
-                if contact_val['vcard']:
-                    v = contact_val['vcard']
-                    data['vCardURL'] = f"https://www.cbre.com{v}" if v.startswith('/') else v
-                else:
-                    data['vCardURL'] = "Not Found"
+                return crawler.scrape_details(url, phone_selector, experience_selector)
             except Exception as e:
-                print(f"Error parsing contact: {e}")
+                print(f"Error scraping {url}: {e}")
+                return {'URL': url, 'Experience': f"Error: {e}"}
+        return self._scrape_batch(scrape, profile_urls, concurrency, delay)
 
-            # --- 3. Extract & Parse Address ---
+    def scrape_property_batch(self, property_urls, concurrency=4, delay=0):
+        """
+        Scrapes many property pages in parallel, yielding (url, data) as each one finishes.
+        See _scrape_batch for how the workers are run.
+        """
+        def scrape(crawler, url):
             try:
-                raw_address = ""
-                
-                if 'cbre.com' in profile_url:
-                    # Logic to find the "Associated Office" address card
-                    js_addr = """
-                        () => {
-                           // Target the specific office card designation
-                           const officeCard = document.querySelector('.cbre-c-inlineCards--office');
-                           if (officeCard) {
-                               const designation = officeCard.querySelector('.cbre-c-inlineCards__personDesignation');
-                               if (designation) {
-                                   return designation.innerText.trim();
-                               }
-                           }
-                           
-                           // Fallback to searching headers if class changed
-                           const headers = Array.from(document.querySelectorAll('h3.cbre-c-inlineCards__title, h2, div'));
-                           const officeHeader = headers.find(h => h.innerText.includes('Associated Office'));
-                           if (officeHeader) {
-                               const container = officeHeader.closest('.cbre-c-inlineCards__contactCardWrapper') || 
-                                                 officeHeader.closest('.cbre-c-inlineCards--office');
-                               if (container) {
-                                   const designation = container.querySelector('.cbre-c-inlineCards__personDesignation');
-                                   if (designation) return designation.innerText.trim();
-                                   return container.innerText.replace('Associated Office', '').replace('Location', '').trim();
-                               }
-                           }
-                           return null;
-                        }
-                    """
-                    raw_address = self.page.evaluate(js_addr) or ""
-                
-                # Cleanup the raw blob
-                junk_terms = [
-                    "Associated Office", "Location", "Get Directions", "Contact", 
-                    "Find Your Perfect Space", "Search Properties", "Search Now", 
-                    "Find My Listings"
-                ]
-                
-                clean_lines = []
-                if raw_address:
-                    for line in raw_address.split('\n'):
-                        s = line.strip()
-                        # Filter out numbers that looks like office phone if they leaked in
-                        if s and s not in junk_terms and not s.startswith("View my") and not s.startswith("+1"):
-                            clean_lines.append(s)
-                
-                data['Full Address'] = "\n".join(clean_lines) if clean_lines else ""
-                
-                # Parsing City/State/Zip from LAST line of cleaned address
-                if clean_lines:
-                    # Heuristic: Last line is "Seattle, WA 98101"
-                    last_line = clean_lines[-1]
-                    
-                    # Everything before last line is street
-                    # If multiple lines remain, join them
-                    street_candidates = clean_lines[:-1]
-                    data['Address Line'] = ", ".join(street_candidates)
-                    
-                    if "," in last_line:
-                        # "Seattle, WA 98101"
-                        parts = last_line.rsplit(",", 1)
-                        data['City'] = parts[0].strip()
-                        
-                        state_zip = parts[1].strip()
-                        # Use regex to handle multiple tabs/spaces from CBRE site
-                        import re
-                        sz_parts = re.split(r'\s+', state_zip)
-                        if len(sz_parts) >= 2:
-                            data['State'] = sz_parts[0]
-                            data['Zip'] = sz_parts[1]
-                        else:
-                            data['State'] = state_zip
-                    else:
-                        # Fallback
-                        data['City'] = last_line
-                        
+                return crawler.scrape_property(url)
             except Exception as e:
-                data['Full Address'] = f"Error: {e}"
+                print(f"Error scraping property {url}: {e}")
+                return {'URL': url, 'Description': f"Error: {e}"}
+        return self._scrape_batch(scrape, property_urls, concurrency, delay)
 
-            # --- 4. Extract Experience ---
-            try:
-                exp_val = "Not Found"
-                if 'cbre.com' in profile_url:
-                    js_script = """
-                        () => {
-                            // Strategy 1: Look for "Professional Experience" header in various forms
-                            const headers = Array.from(document.querySelectorAll('div.cbre-c-inlineBodyCard__title, h2, h3'));
-                            const targetHeader = headers.find(h => h.innerText.trim().includes('Professional Experience'));
-                            
-                            if (targetHeader) {
-                                // Try description sibling
-                                let desc = targetHeader.parentElement.querySelector('.cbre-c-inlineBodyCard__description');
-                                if (desc) return desc.innerText.trim();
-                                
-                                // Try next sibling
-                                if (targetHeader.nextElementSibling) return targetHeader.nextElementSibling.innerText.trim();
-                                
-                                // Try parent's content excluding header
-                                return targetHeader.parentElement.innerText.replace(targetHeader.innerText, '').trim();
-                            }
-                            return null;
-                        }
-                    """
-                    exp_val = self.page.evaluate(js_script) or "Not Found"
-                    
-                data['Experience'] = exp_val
-                
-                # --- 4.5 Extract Specialties & Pilot Keywords ---
-                try:
-                    js_spec = """
-                        () => {
-                            const bioEl = document.querySelector('.cbre-c-inlineBodyCard__description.cbre-c-wysiwyg');
-                            const bioText = bioEl ? bioEl.innerText : "";
-                            
-                            const specs = [];
-                            document.querySelectorAll('.cbre-c-inlineCards__specialtyTag, .cbre-c-cl-tag').forEach(el => {
-                                specs.push(el.innerText.trim());
-                            });
-                            
-                            // Heuristic keywords for March Pilot (Case-Insensitive check)
-                            const keywords = ["Industrial", "Logistics", "Kent Valley", "South Seattle", "Tenant Representation", "Landlord Representation", "Office", "Retail", "Investment Sales"];
-                            const foundKeywords = keywords.filter(k => {
-                                const rel = new RegExp(k, 'i');
-                                return rel.test(bioText);
-                            });
-                            
-                            // Combine structured tags and bio keywords
-                            const allSpecs = [...new Set([...specs, ...foundKeywords])];
-                            
-                            // Get first paragraph / sentence for bio summary
-                            const firstParagraph = bioText.split('\\n\\n')[0] || bioText.split(/[.!]/)[0];
-
-                            return {
-                                specialties: allSpecs.join(', '),
-                                specialty_tags: allSpecs,
-                                bio_summary: firstParagraph.trim()
-                            };
-                        }
-                    """
-                    spec_res = self.page.evaluate(js_spec)
-                    data['Specialties'] = spec_res['specialties'] or "N/A"
-                    data['specialty_tags'] = spec_res['specialty_tags']
-                    data['bio_summary'] = spec_res['bio_summary'] or data.get('Experience', '')[:500]
-                except:
-                    data['Specialties'] = "N/A"
-                    data['specialty_tags'] = []
-                    data['bio_summary'] = data.get('Experience', '')[:500]
+    def _scrape_batch(self, scrape, urls, concurrency, delay):
+        """
+        Runs scrape(crawler, url) over `urls` on `concurrency` worker threads, yielding (url, data).
+        Playwright's sync API is bound to the thread that started it, so each worker thread
+        runs its own crawler/browser with this crawler's settings and shared VectorDB connection
+        (or, when attached over CDP, its own connection + context on the shared browser), reused
+        for all of its URLs. With concurrency=1 the URLs run in the calling thread on this crawler.
+        `delay` is the minimum time between page starts (politeness), enforced by one RateLimiter
+        shared across workers; time already spent scraping counts towards it.
+        Closing the generator early stops the workers after their current page.
+        """
+        urls = list(urls)
+        if not urls:
+            return
 
-            except Exception as e:
-                data['Experience'] = f"Error: {e}"
+        limiter = RateLimiter(delay) if delay else None
+
+        if concurrency <= 1:
+            # Sequential: stay on this crawler so its already-warm browser, context and HTTP cache are reused
+            for url in urls:
+                if limiter:
+                    limiter.acquire()
+                yield url, scrape(self, url)
+            return
 
-            # --- 5. Extract Linked Properties & Listings ---
+        url_queue = queue.Queue()
+        for url in urls:
+            url_queue.put(url)
+        result_queue = queue.Queue()
+        stop_event = threading.Event()
+
+        def worker():
+            crawler = GenericCrawler(
+                headless=self.headless,
+                disable_vectors=self.vector_db is None,
+                vector_db=self.vector_db,
+                block_resources=self.block_resources,
+                block_stylesheets=self.block_stylesheets,
+                rotate_every=self.rotate_every,
+                cdp_endpoint=self.cdp_endpoint,
+                static_fetch=self.static_fetch
+            )
             try:
-                js_props = """
-                    () => {
-                        const res = {listingsUrl: null, transactions: [], debug: {}};
-                        
-                        // 1. Get Listings URL if any
-                        const links = Array.from(document.querySelectorAll('a'));
-                        const listingLink = links.find(a => a.innerText.includes('Search Properties') || a.innerText.includes('View My Listings'));
-                        if (listingLink) res.listingsUrl = listingLink.href;
-                        
-                        // 2. Get Significant Transactions
-                        const headers = Array.from(document.querySelectorAll('h3, h4, div.cbre-c-inlineBodyCard__title'));
-                        const transHeader = headers.find(h => h.innerText.trim() === 'Significant Transactions');
-                        
-                        if (transHeader) {
-                            const container = transHeader.closest('.cbre-c-inlineBodyCard');
-                            if (container) {
-                                // Clone to safe manipulation
-                                const clone = container.cloneNode(true);
-                                
-                                // Remove known junk items / promo cards that share the space
-                                const junkSelectors = ['.cbre-c-inlineBodyCard__card', '.cbre-c-inlineBodyCard__title'];
-                                junkSelectors.forEach(sel => {
-                                    clone.querySelectorAll(sel).forEach(el => el.remove());
-                                });
-                                
-                                // Extract clean text
-                                const text = clone.innerText.trim();
-                                if (text) {
-                                    // Split logic could be added here if structure is consistent
-                                    res.transactions.push(text);
-                                }
-                            }
-                        }
-                        
-                        return res;
-                    }
-                """
-                props_val = self.page.evaluate(js_props)
-                
-                # Parse Significant Transactions from the text blob if needed
-                raw_tx = props_val['transactions']
-                clean_tx = []
-                
-                if raw_tx and isinstance(raw_tx, list):
-                    blob = "\n".join(raw_tx)
-                    
-                    # Section markers
-                    start_marker = "Significant Transactions"
-                    end_marker = "Clients Represented" # Heuristic based on seen profile
-                    
-                    if start_marker in blob:
+                while not stop_event.is_set():
+                    try:
+                        url = url_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if limiter:
+                        limiter.acquire(sleep=stop_event.wait)
+                        if stop_event.is_set():
+                            break
+                    result_queue.put((url, scrape(crawler, url)))
+            finally:
+                crawler.close_browser()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = [pool.submit(worker) for _ in range(min(concurrency, len(urls)))]
+            try:
+                for _ in urls:
+                    # Poll so we notice if every worker died (e.g. browser failed to launch)
+                    while True:
                         try:
-                            start_idx = blob.find(start_marker) + len(start_marker)
-                            end_idx = blob.find(end_marker, start_idx)
-                            
-                            if end_idx == -1:
-                                # Try end of string
-                                chunk = blob[start_idx:]
-                            else:
-                                chunk = blob[start_idx:end_idx]
-                                
-                            # Clean up the chunk (it is newline separated)
-                            lines = [l.strip() for l in chunk.split('\n') if l.strip()]
-                            
-                            # Heuristic: The transactions appear in blocks of 4 lines (Name, Location, Type, Size)
-                            if len(lines) > 0 and len(lines) % 4 == 0:
-                                groups = []
-                                for i in range(0, len(lines), 4):
-                                    groups.append({
-                                        'Name': lines[i],
-                                        'Location': lines[i+1],
-                                        'Type': lines[i+2],
-                                        'Size': lines[i+3]
-                                    })
-                                clean_tx = groups
-                            else:
-                                clean_tx = lines
-                        except Exception as e:
-                            print(f"Error parsing transaction blob: {e}")
-                            clean_tx = raw_tx # Fallback
-                    else:
-                         # Maybe the list is the whole thing?
-                         clean_tx = raw_tx
-                
-                data['LinkedProperties'] = clean_tx
-                data['ListingsURL'] = props_val['listingsUrl']
-            except Exception as e:
-                data['LinkedProperties'] = []
-                data['ListingsURL'] = ""
-                print(f"Error extracting linked properties: {e}")
+                            yield result_queue.get(timeout=0.5)
+                            break
+                        except queue.Empty:
+                            if all(f.done() for f in futures) and result_queue.empty():
+                                print("All scraper workers exited early.")
+                                return
+            finally:
+                stop_event.set()
 
+    def _scrape_property_static(self, property_url):
+        """
+        Builds the property record from the server-rendered HTML (fetched through the browser
+        context, so cookies/UA match) without rendering the page. Returns None when the HTML
+        lacks a title or server-rendered broker cards (they're only in the contact modal), i.e.
+        the page needs the rendered path. Sections, brochure and contact blocks are read the same
+        way the rendered path reads them.
+        """
+        try:
+            resp = self.context.request.get(property_url, timeout=20000)
+            if not resp.ok:
+                return None
+            soup = BeautifulSoup(resp.text(), 'html.parser')
         except Exception as e:
-            print(f"Error scraping {profile_url}: {e}")
-        
-        # Upsert to Pinecone
-        if self.vector_db:
-             self.vector_db.upsert_person(data)
-             
-        return data
+            print(f"    Static fetch failed ({e}), rendering instead...")
+            return None
+
+        title_el = soup.select_one('h1')
+        title_text = title_el.get_text('\n', strip=True) if title_el else ""
+        if len(title_text) <= 5 or title_text.lower() in ['www.cbre.com', 'cbre']:
+            return None
+        broker_els = soup.select(STATIC_BROKER_SELECTOR)
+        if not broker_els:
+            return None
+        addr_el = soup.select_one(STATIC_ADDRESS_SELECTOR)
+
+        rec = PropertyRecord(URL=property_url)
+        t_parts = [p.strip() for p in title_text.split('\n') if p.strip()]
+        rec.Property_Name = t_parts[0]
+        if len(t_parts) > 1:
+            rec.Address = ", ".join(t_parts[1:])
+        if addr_el:
+            raw_addr = addr_el.get_text(' ', strip=True)
+            if raw_addr and raw_addr.lower() not in rec.Address.lower():
+                rec.Address = f"{rec.Address}, {raw_addr}" if rec.Address else raw_addr
+
+        # Contacts shown outside the modal first, then the broker cards (same order as the rendered path)
+        rec.Brokers.extend(_contact_block_brokers(_soup_contact_blocks(soup)))
+
+        for broker_el in broker_els:
+            name_el = broker_el.select_one('[class*="name"]') or broker_el.select_one('strong, span, h4')
+            pairs = []
+            for a in broker_el.select('a[href^="tel:"]'):
+                label = a.get_text(strip=True).lower() or a.get('aria-label') or ""
+                parent_text = a.parent.get_text(' ', strip=True).lower() if a.parent else ""
+                pairs.append((a['href'].replace('tel:', '').strip(), f"{label} {parent_text}"))
+            office_phone, mobile_phone, clean_phones = classify_phones(pairs)
+            broker_info = {
+                'phone_number': office_phone,
+                'mobile_phoneNumber': mobile_phone,
+                'phone_numbers': clean_phones,
+                'Emails': [a.get_text(strip=True).replace('mailto:', '') for a in broker_el.select('a[href^="mailto:"]')]
+            }
+            if name_el:
+                broker_info['Name'] = name_el.get_text(strip=True)
+            if broker_info.get('Name') or clean_phones:
+                rec.Brokers.append(broker_info)
+                print(f"    - Agent Found: {broker_info.get('Name')}")
+
+        desc_el = soup.select_one(PROPERTY_DESCRIPTION_SELECTOR)
+        fallback = desc_el.get_text('\n', strip=True)[:1500] if desc_el else ""
+        rec.Description = _property_description(*_soup_sections(soup), fallback)
+        sqft_box = soup.select_one(SQFT_CONTAINER_SELECTOR)
+        sqft_match = (sqft_box and SQFT_RE.search(sqft_box.get_text(' '))) or SQFT_RE.search(soup.get_text(' ')[:20000])
+        rec.SqFt = sqft_match.group(0) if sqft_match else ""
+
+        b_link = _soup_brochure(soup, property_url)
+        if b_link:
+            rec.Brochure_URL = b_link
+
+        # Same name/address de-duplication as the rendered path
+        if rec.Address and rec.Property_Name and rec.Address.lower().startswith(rec.Property_Name.lower()):
+            rec.Address = rec.Address[len(rec.Property_Name):].strip().lstrip(',').strip()
+
+        print(f"    > Static HTML was enough: {len(rec.Brokers)} brokers, address '{rec.Address}'")
+        return rec.to_dict()
 
     def scrape_property(self, property_url):
         """
         Scrapes details from a property page, specifically handling the 'Contact for Details' modal.
         """
-        data = {
-            'URL': property_url,
-            'Property Name': '',
-            'Address': '',
-            'Description': '',
-            'Brokers': [],
-            'Brochure URL': 'Not Found'
-        }
+        rec = PropertyRecord(URL=property_url)
         
         print(f"  > Property Scraper visiting: {property_url}")
         
         if not self.page:
             self.start_browser()
+        self._rotate_context_if_due()
+
+        # Most listing pages render title/address/brokers server-side; skip the browser when they do
+        if self.static_fetch and BeautifulSoup is not None:
+            static_data = self._scrape_property_static(property_url)
+            if static_data:
+                if self.vector_db:
+                    self.vector_db.upsert_property(static_data)
+                return static_data
             
         try:
             self.page.goto(property_url, timeout=45000, wait_until='domcontentloaded')
@@ -668,210 +1441,101 @@ class GenericCrawler:
                 cookie_btn = self.page.query_selector('#onetrust-accept-btn-handler, #onetrust-consent-sdk button, .cookie-banner button')
                 if cookie_btn and cookie_btn.is_visible():
                     print("    Dismissing cookie banner...")
+                    # Fire-and-forget: nothing below needs the banner gone first
                     cookie_btn.click()
-                    time.sleep(1)
             except: pass
 
             # Wait for meaningful content
             try:
-                self.page.wait_for_selector('h1', timeout=10000)
-                # Give SPA a moment to fill text
-                for _ in range(5):
-                    if len(self.page.inner_text('h1').strip()) > 5: break
-                    time.sleep(1)
+                # h1 present and filled in by the SPA (returns as soon as it is, no fixed sleeps)
+                self.page.wait_for_function(JS_H1_FILLED, timeout=15000)
             except: pass
             
             # --- 1. Basic Info (Name & Initial Address) ---
-            title_el = self.page.query_selector('h1')
-            if title_el:
-                title_text = title_el.inner_text().strip()
+            title_text = self.page.evaluate(JS_H1_TEXT)
+            if title_text:
                 # Filter out generic placeholder titles
                 if title_text.lower() in ['www.cbre.com', 'cbre']:
                     title_text = ""
                 
                 if title_text:
                     t_parts = [p.strip() for p in title_text.split('\n') if p.strip()]
-                    data['Property Name'] = t_parts[0]
+                    rec.Property_Name = t_parts[0]
                     if len(t_parts) > 1:
-                        data['Address'] = ", ".join(t_parts[1:])
+                        rec.Address = ", ".join(t_parts[1:])
 
             # --- 2. Initial Data Scan (Static Contacts & Brochure) ---
             # Some pages have contacts visible without a modal
-            static_brokers = self.page.query_selector_all('div[class*="contact"], div[class*="agent"], section[class*="contact"]')
-            for s_el in static_brokers:
-                txt = s_el.inner_text().lower()
-                if any(k in txt for k in ["contact", "agent", "broker"]):
-                    # If we find a block with a phone or email pattern, extract it
-                    import re
-                    # Improved: Check for tel: links first
-                    tel_links = s_el.query_selector_all('a[href^="tel:"]')
-                    clean_phones = []
-                    mobile_phone = None
-                    office_phone = None
-                    
-                    for tel in tel_links:
-                        raw = tel.get_attribute('href').replace('tel:', '')
-                        label = tel.inner_text().lower() or tel.get_attribute('aria-label') or ""
-                        cleaned = self.format_phone(raw)
-                        if cleaned:
-                            if any(k in label for k in ['cell', 'mobile', 'handset']) and not mobile_phone:
-                                mobile_phone = cleaned
-                            elif not office_phone:
-                                office_phone = cleaned
-                            clean_phones.append(cleaned)
-                            
-                    # Fallback to regex if no tel links
-                    if not clean_phones:
-                        raw_regex = list(set(re.findall(r'(\d{3}[-\.\s]??\d{3}[-\.\s]??\d{4})', s_el.inner_text())))
-                        for r in raw_regex:
-                            c = self.format_phone(r)
-                            if c: clean_phones.append(c)
-                            if not office_phone: office_phone = c
-
-                    emails = list(set(re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', s_el.inner_text())))
-                    if clean_phones or emails:
-                        name_el = s_el.query_selector('strong, h3, h4, [class*="name"]')
-                        name = name_el.inner_text().strip() if name_el else "Contact"
-                        data['Brokers'].append({
-                            'Name': name, 
-                            'phone_number': office_phone,
-                            'mobile_phoneNumber': mobile_phone,
-                            'phone_numbers': clean_phones,
-                            'Emails': emails
-                        })
-                        print(f"    - Static Agent Found: {name}")
+            # Text, tel: links and name of every candidate block in one round-trip (no element handles)
+            static_blocks = self.page.eval_on_selector_all(STATIC_CONTACT_SELECTOR, JS_STATIC_CONTACT_BLOCKS)
+            rec.Brokers.extend(_contact_block_brokers(static_blocks))
 
             # Greedy Brochure Detection (Hero, Modal, Spaces)
             def find_brochure():
-                search_js = """
-                () => {
-                    const results = [];
-                    // 1. Check all elements with data attributes commonly used for links
-                    document.querySelectorAll('[data-pill-link-info], [data-url], [data-href]').forEach(el => {
-                        const url = el.getAttribute('data-pill-link-info') || el.getAttribute('data-url') || el.getAttribute('data-href');
-                        const label = (el.innerText + (el.getAttribute('data-pill-asset-type') || "")).toLowerCase();
-                        if (url && label.includes('brochure')) results.push(url);
-                    });
-                    
-                    // 2. Check all anchors and buttons with "Brochure" text
-                    document.querySelectorAll('a, button, div.cbre-c-pd-hero__button, div[class*="pill"], div.cbre-c-pd-collateralBar__pillContainer').forEach(el => {
-                        if (el.innerText.toLowerCase().includes('brochure')) {
-                            const href = el.href || el.getAttribute('href');
-                            if (href) results.push(href);
-                            else {
-                                // Check children/parents for href
-                                const pLink = el.closest('a');
-                                if (pLink) results.push(pLink.href);
-                                const cLink = el.querySelector('a');
-                                if (cLink) results.push(cLink.href);
-                            }
-                        }
-                    });
-                    return results;
-                }
-                """
-                candidates = self.page.evaluate(search_js)
-                if candidates:
-                    current_path = property_url.split('?')[0].rstrip('/')
-                    for b_url in candidates:
-                        if not b_url or b_url.startswith('#') or 'javascript:' in b_url: continue
-                        if b_url.startswith('/'): b_url = f"https://www.cbre.com{b_url}"
-                        
-                        check_url = b_url.split('?')[0].rstrip('/')
-                        is_likely_file = any(ext in b_url.lower() for ext in ['.pdf', '.doc', '.zip', 'fileassets', 'resources', 'brochure'])
-                        
-                        if check_url != current_path and is_likely_file:
-                            return b_url
-                return None
+                return self._extract('brochure', property_url)
 
             b_link = find_brochure()
             if b_link: 
-                data['Brochure URL'] = b_link
-                print(f"    Found Brochure (Main): {data['Brochure URL']}")
+                rec.Brochure_URL = b_link
+                print(f"    Found Brochure (Main): {rec.Brochure_URL}")
 
             # --- 3. Contact For Details Modal (Associated Contacts) ---
             try:
                 # Force click modal even if we have some brokers, to see if more/brochure exists
                 btn_selector = '.cbre-c-pd-brokerCard__button, button:has-text("Contact For Details"), button:has-text("Contact Agent"), .cbre-c-pd-brokerCard__contact-button'
-                btns = self.page.query_selector_all(btn_selector)
-                for i, btn in enumerate(btns):
-                    try:
-                        if btn.is_visible():
-                            print(f"    Opening Modal (Button {i+1})...")
-                            self.page.evaluate('el => el.click()', btn)
-                            break
-                    except: continue
+                # Visibility check + click of the first visible button in one round-trip
+                i = self.page.locator(btn_selector).evaluate_all(JS_CLICK_FIRST_VISIBLE)
+                if i >= 0:
+                    print(f"    Opening Modal (Button {i+1})...")
                 
                 # Check for Modal
                 try:
                     self.page.wait_for_selector('.cbre-c-pl-contact-form, .cbre-c-pl-contact-form__content', timeout=5000)
                     print("    Modal appeared.")
-                    time.sleep(1) # Wait for brokers to render
-                    # Try finding brochure again in modal
-                    b_link_modal = find_brochure()
-                    if b_link_modal and data['Brochure URL'] == 'Not Found':
-                        data['Brochure URL'] = b_link_modal
-                        print(f"    Found Brochure (Modal): {data['Brochure URL']}")
+                    # Wait for brokers to render
+                    try:
+                        self.page.wait_for_selector(', '.join(BROKER_CARD_SELECTORS), timeout=3000)
+                    except: pass
+                    # Try finding brochure again in modal (only if the page itself had none)
+                    b_link_modal = find_brochure() if rec.Brochure_URL == 'Not Found' else None
+                    if b_link_modal:
+                        rec.Brochure_URL = b_link_modal
+                        print(f"    Found Brochure (Modal): {rec.Brochure_URL}")
                 except:
                     print("    Contact modal didn't appear in time.")
                     
-                # Try primary selector first, fallback to any cards
-                brokers_els = self.page.query_selector_all('.cbre-c-pl-contact-form__broker-content') or \
-                              self.page.query_selector_all('.cbre-c-pl-contact-form__broker') or \
-                              self.page.query_selector_all('[class*="broker"]')
+                # Try primary selector first, fallback to any cards (all cards read in one evaluate)
+                brokers = self._extract('propertyBrokers', BROKER_CARD_SELECTORS)
 
-                for broker_el in brokers_els:
+                for broker in brokers:
                     broker_info = {}
-                    name_el = broker_el.query_selector('[class*="name"]') or broker_el.query_selector('strong, span, h4')
-                    if name_el:
-                        broker_info['Name'] = name_el.inner_text().strip()
+                    if broker['name'] is not None:
+                        broker_info['Name'] = broker['name']
                         
                     # Phones & Emails
-                    phones_els = broker_el.query_selector_all('a[href^="tel:"]')
-                    raw_phone_data = []
-                    for p_el in phones_els:
-                        number = p_el.get_attribute('href').replace('tel:', '').strip()
-                        # Check link text, aria-label, and parent text for labels
-                        label = p_el.inner_text().lower() or p_el.get_attribute('aria-label') or ""
-                        parent = p_el.query_selector('xpath=..')
-                        parent_text = parent.inner_text().lower() if parent else ""
-                        full_context = f"{label} {parent_text}"
-                        raw_phone_data.append({'label': full_context, 'number': number})
-                    
-                    clean_phones = []
-                    mobile_phone = None
-                    office_phone = None
-                    for pi in raw_phone_data:
-                        c = self.format_phone(pi['number'])
-                        if c:
-                            if any(k in pi['label'] for k in ['cell', 'mobile', 'handset']) and not mobile_phone:
-                                mobile_phone = c
-                            elif not office_phone:
-                                office_phone = c
-                            clean_phones.append(c)
-                            
+                    office_phone, mobile_phone, clean_phones = classify_phones(
+                        (pi['number'], pi['label']) for pi in broker['phones']
+                    )
                     broker_info['phone_number'] = office_phone
                     broker_info['mobile_phoneNumber'] = mobile_phone
                     broker_info['phone_numbers'] = clean_phones
                     
-                    email_els = broker_el.query_selector_all('a[href^="mailto:"]')
-                    broker_info['Emails'] = [e.inner_text().replace('mailto:', '').strip() for e in email_els]
+                    broker_info['Emails'] = broker['emails']
                     
                     if broker_info.get('Name') or broker_info.get('phone_numbers'):
-                        data['Brokers'].append(broker_info)
+                        rec.Brokers.append(broker_info)
                         print(f"    - Agent Found: {broker_info.get('Name')}")
                         
-                if not data['Brokers']:
+                if not rec.Brokers:
                     print("    No brokers found in modal. Trying greedy text search...")
                     try:
                         modal_sel = '.cbre-c-pl-contact-form, .cbre-c-pl-contact-form__content'
                         txt = self.page.inner_text(modal_sel)
-                        import re
-                        emails = list(set(re.findall(r'[\w\.-]+@[\w\.-]+\.\w+', txt)))
-                        raw_phones = list(set(re.findall(r'(\d{3}[-\.\s]??\d{3}[-\.\s]??\d{4})', txt)))
-                        clean_phones = [self.format_phone(p) for p in raw_phones if self.format_phone(p)]
+                        emails = list(dict.fromkeys(EMAIL_RE.findall(txt)))
+                        raw_phones = list(dict.fromkeys(PHONE_RE.findall(txt)))
+                        clean_phones = [c for c in map(self.format_phone, raw_phones) if c]
                         if emails or clean_phones:
-                            data['Brokers'].append({'Name': 'Alternative Contact', 'phone_numbers': clean_phones, 'Emails': emails})
+                            rec.Brokers.append({'Name': 'Alternative Contact', 'phone_numbers': clean_phones, 'Emails': emails})
                             print(f"    - Greedy Contacts Found: {len(clean_phones)} phones, {len(emails)} emails")
                     except: pass
             except Exception as e:
@@ -879,99 +1543,46 @@ class GenericCrawler:
 
             # --- 4. Precision Extraction (Address & Highlights) ---
             try:
-                js_script = """
-                () => {
-                    const sections = {};
-                    const getCleanText = (el) => el ? el.innerText.replace(/\\s+/g, ' ').trim() : "";
-                    const searchTags = ['h1', 'h2', 'h3', 'h4', 'h5', 'div.cbre-c-pd-overview__title', 'strong'];
-                    document.querySelectorAll(searchTags.join(',')).forEach(el => {
-                        const txt = el.innerText.trim().toLowerCase();
-                        let key = null;
-                        if (txt === "highlights" || txt.includes("highlights")) key = "Highlights";
-                        else if (txt === "overview" || txt.includes("overview")) key = "Overview";
-                        
-                        if (key && !sections[key]) {
-                            let content = [];
-                            let runner = el.nextElementSibling;
-                            if (!runner && el.parentElement) runner = el.parentElement.nextElementSibling;
-                            let b = 0;
-                            while (runner && b < 10) { // Check more blocks
-                                if (['H1','H2','H3','H4'].includes(runner.tagName)) break;
-                                const t = getCleanText(runner);
-                                if (t.length > 5) { content.push(t); b++; }
-                                runner = runner.nextElementSibling;
-                            }
-                            sections[key] = content.join('\\n');
-                        }
-                    });
-                    
-                    let addr = "";
-                    const sels = ['.cbre-c-pd-hero__address', '.cbre-c-pd-hero__sub-title', 'address', '.cbre-c-pd-description__address'];
-                    for (const s of sels) {
-                        const el = document.querySelector(s);
-                        if (el && el.innerText.trim().length > 5 && el.innerText.trim().length < 200) { 
-                            addr = el.innerText.trim(); 
-                            break; 
-                        }
-                    }
-                    
-                    if (!addr) {
-                        const candidates = Array.from(document.querySelectorAll('p, div, span'))
-                            .filter(el => el.innerText.trim().length > 10 && el.innerText.trim().length < 100 && el.innerText.match(/[A-Z]{2}\\s+\\d{5}/));
-                        if (candidates.length > 0) addr = candidates[0].innerText.trim();
-                    }
-                    
-                    let fb = "";
-                    const m = document.querySelector('.cbre-c-pd-overview__description, .cbre-c-pd-description, .cbre-c-pd-text-media__description, #overview');
-                    if (m) fb = m.innerText.trim().slice(0, 1500);
-                    
-                    let sqft = "";
-                    const sqft_match = document.body.innerText.match(/(\\d{1,3}(?:,\\d{3})*\\s*-\\s*)?\\d{1,3}(?:,\\d{3})*\\s*SF/i);
-                    if (sqft_match) sqft = sqft_match[0];
-
-                    return { highlights: sections['Highlights']||"", overview: sections['Overview']||"", fallback: fb, address: addr, sqft: sqft };
-                }
-                """
-                res = self.page.evaluate(js_script)
-                data['SqFt'] = res.get('sqft', 'N/A')
+                res = self._extract('propertyDetails')
+                rec.SqFt = res.get('sqft', 'N/A')
                 
                 # Format Description
-                parts = []
-                if res.get('highlights'): parts.append(f"Highlights:\\n{res['highlights']}")
-                if res.get('overview'): parts.append(f"Overview:\\n{res['overview']}")
-                if not parts and res.get('fallback'): parts.append(res['fallback'])
-                data['Description'] = "\\n\\n".join(parts)
+                rec.Description = _property_description(res.get('highlights'), res.get('overview'), res.get('fallback'))
                 
                 # Set Address
                 raw_addr = res.get('address', '')
                 if raw_addr:
                     # If we have Address from H1 already, check if raw_addr is just city/state
-                    if data['Address']:
+                    if rec.Address:
                         # If H1 had street, and raw_addr is city/state, join them properly
                         # But prevent "Street, Street, City"
-                        if raw_addr.lower() not in data['Address'].lower():
-                            data['Address'] = f"{data['Address']}, {raw_addr}"
+                        if raw_addr.lower() not in rec.Address.lower():
+                            rec.Address = f"{rec.Address}, {raw_addr}"
                     else:
-                        data['Address'] = raw_addr
+                        rec.Address = raw_addr
 
                 # Final de-duplicate Name from Address
-                if data['Address'] and data['Property Name']:
+                if rec.Address and rec.Property_Name:
                     # Only remove the EXACT name if it's a prefix
-                    name = data['Property Name'].lower()
-                    addr_low = data['Address'].lower()
+                    name = rec.Property_Name.lower()
+                    addr_low = rec.Address.lower()
                     if addr_low.startswith(name):
-                        data['Address'] = data['Address'][len(name):].strip().lstrip(',').strip()
+                        rec.Address = rec.Address[len(name):].strip().lstrip(',').strip()
                 
-                print(f"    > Extracted Address: {data['Address']}")
-                print(f"    > Extracted Description: {len(data['Description'])} chars")
+                print(f"    > Extracted Address: {rec.Address}")
+                print(f"    > Extracted Description: {len(rec.Description)} chars")
             except Exception as e:
                 print(f"    Error in JS extraction: {e}")
 
         except Exception as e:
             print(f"Error scraping property: {e}")
             
+        data = rec.to_dict()
+
         # 5. Save to Vector DB
         if self.vector_db:
             self.vector_db.upsert_property(data)
             
         return data
+
+atexit.register(GenericCrawler._close_shared)
@@ -1,23 +1,65 @@
 import os
-import json
 import re
 import logging
+import threading
 import time
-from pinecone import Pinecone, ServerlessSpec, SearchQuery
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
+from pinecone import SearchQuery
 from dotenv import load_dotenv
+try:
+    from crawler_app.pinecone_client import INDEX_HOST, get_client, get_index
+except ImportError:
+    from pinecone_client import INDEX_HOST, get_client, get_index
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Pinecone namespaces for each record type
+PERSON_NAMESPACE = "seattle_directory"
+PROPERTY_NAMESPACE = "seattle_listings"
+
+# Records per upsert_records call (integrated-inference upserts accept at most 96)
+UPSERT_BATCH_SIZE = max(1, min(int(os.getenv("PINECONE_UPSERT_BATCH", "96")), 96))
+# Batches uploaded in parallel
+UPSERT_THREADS = max(1, int(os.getenv("PINECONE_POOL_THREADS", "8")))
+# Inputs per OpenAI embeddings request
+EMBEDDING_BATCH_SIZE = 96
+# Per-input cap, safely under text-embedding-3-small's 8192-token limit
+EMBEDDING_MAX_CHARS = 8000
+
+# ID pages fetched in parallel while listing a namespace's URLs
+SCAN_FETCH_THREADS = 4
+
+# Longest bio stored with a person record (search only shows the first 200 chars)
+BIO_MAX_CHARS = 500
+# Record fields search() formats; the rest (embedded 'text', email, tags, ...) aren't sent back
+SEARCH_FIELDS = [
+    'type', 'full_name', 'mobile_number', 'phone_number', 'vcard_url', 'bio',
+    'address', 'brochure_url', 'primary_broker', 'broker_phone'
+]
+
+# Generic searches stop waiting for the other namespace once one returns top_k hits scoring at least this
+SEARCH_SHORTCUT_SCORE = float(os.getenv("SEARCH_SHORTCUT_TAU", "0.85"))
+
+# slugify() / clean_embedding_text() patterns, compiled once
+SLUG_STRIP_RE = re.compile(r'[^\w\s-]')
+SLUG_SEPARATOR_RE = re.compile(r'[\s_-]+')
+WHITESPACE_RE = re.compile(r'\s+')
+
 def slugify(text):
     """Generates a clean ID from text (e.g., 'Joe Riley' -> 'joe-riley')."""
     if not text: return "unknown"
     text = text.lower().strip()
-    text = re.sub(r'[^\w\s-]', '', text)
-    text = re.sub(r'[\s_-]+', '-', text)
-    text = re.sub(r'^-+|-+$', '', text)
-    return text
+    text = SLUG_STRIP_RE.sub('', text)
+    text = SLUG_SEPARATOR_RE.sub('-', text)
+    return text.strip('-')
+
+def clean_embedding_text(text):
+    """Collapses whitespace runs (newlines, tabs, padding) to single spaces and caps the length for the embeddings API."""
+    return WHITESPACE_RE.sub(' ', text).strip()[:EMBEDDING_MAX_CHARS]
 
 class VectorDB:
     def __init__(self):
@@ -31,18 +73,30 @@ class VectorDB:
         self.api_key = os.getenv("PINECONE_API_KEY")
         self.env = os.getenv("PINECONE_ENV") 
         self.index_name = os.getenv("PINECONE_INDEX", "cbre")
-        self.index_host = "https://cbre-5eba2yo.svc.aped-4627-b74a.pinecone.io"
+        self.index_host = INDEX_HOST
         
         self.pc = None
         self.index = None
+
+        # Upsert batching: records are buffered per namespace and sent UPSERT_BATCH_SIZE at a
+        # time on a small thread pool (see _enqueue / flush)
+        self._upsert_buffers = {}
+        self._pending_upserts = []
+        self._upsert_lock = threading.Lock()
+        self._upsert_pool = None
+        # Generic searches query both namespaces at once (threads start on first use)
+        self._search_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pinecone-search")
+        self._known_urls = {} # namespace -> set of URLs (None if listing failed), filled by preload_urls()
+        self._preload_lock = threading.Lock()
         
         self.vector_dimension = 1024 # User's index dimension
         
         if self.api_key:
             try:
                 logger.info(f"Connecting to Pinecone Host: {self.index_host}")
-                self.pc = Pinecone(api_key=self.api_key)
-                self.index = self.pc.Index(host=self.index_host)
+                # Shared with every other VectorDB / script in this process
+                self.index = get_index()
+                self.pc = get_client()
                 logger.info(f"Connected to Pinecone Index successfully.")
             except Exception as e:
                 logger.error(f"Error initializing VectorDB: {e}")
@@ -52,146 +106,323 @@ class VectorDB:
             raise ValueError("Missing PINECONE_API_KEY")
 
     def get_embedding(self, text):
-        if not self.openai:
-            return None
-        try:
-            text = text.replace("\n", " ")
-            # Use text-embedding-3-small which supports dimension parameter
-            response = self.openai.embeddings.create(
-                input=[text], 
-                model="text-embedding-3-small",
-                dimensions=self.vector_dimension
-            )
-            return response.data[0].embedding
-        except Exception as e:
-            print(f"Error generating embedding: {e}")
-            return None
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """
+        OpenAI embeddings for `texts`, EMBEDDING_BATCH_SIZE inputs per request, aligned with
+        the input order (None where a request failed). Records upserted by this class are
+        embedded by Pinecone (integrated inference), so this is only for raw vectors.
+        """
+        openai = getattr(self, 'openai', None)
+        if not openai:
+            return [None] * len(texts)
+        vectors = []
+        for i in range(0, len(texts), EMBEDDING_BATCH_SIZE):
+            chunk = [clean_embedding_text(t) for t in texts[i:i + EMBEDDING_BATCH_SIZE]]
+            try:
+                # Use text-embedding-3-small which supports dimension parameter
+                response = openai.embeddings.create(
+                    input=chunk, 
+                    model="text-embedding-3-small",
+                    dimensions=self.vector_dimension
+                )
+                vectors.extend(d.embedding for d in sorted(response.data, key=lambda d: d.index))
+            except Exception as e:
+                print(f"Error generating embeddings: {e}")
+                vectors.extend([None] * len(chunk))
+        return vectors
 
     def exists(self, url, namespace=None):
-        """Checks if a URL already exists in the index/namespace by querying metadata."""
+        """
+        Checks if a URL already exists in the index/namespace. Answered from the URLs a batch caller
+        loaded with preload_urls; without them (or if that listing failed) this returns False and
+        the keyed check at upsert time (see _claim_url) catches the duplicate.
+        """
         if not self.index: return False
+        known = self._known_urls.get(namespace)
+        return known is not None and url in known
+
+    def preload_urls(self, namespace):
+        """
+        Loads every URL stored in a namespace so exists() and the upsert duplicate check answer
+        without a lookup per URL. Meant for batch runs; returns the count.
+        """
+        with self._preload_lock:
+            try:
+                urls = self._scan_urls(namespace)
+            except Exception as e:
+                logger.error(f"Error listing URLs in namespace {namespace}: {e}")
+                urls = None # the upsert check falls back to keyed lookups
+            with self._upsert_lock:
+                self._known_urls[namespace] = urls
+        return len(urls) if urls is not None else 0
+
+    def list_urls(self, namespace):
+        """Returns the set of 'url' metadata values for every record in a namespace."""
+        if not self.index: return set()
         try:
-            # Query by 'url' metadata field instead of ID
-            res = self.index.query(
-                vector=[0.0] * self.vector_dimension,
-                top_k=1,
-                filter={'url': url},
-                namespace=namespace
-            )
-            return len(res.get('matches', [])) > 0
+            return self._scan_urls(namespace)
         except Exception as e:
-            # print(f"Exists check error: {e}")
-            return False
+            logger.error(f"Error listing URLs in namespace {namespace}: {e}")
+            return set()
+
+    def _scan_urls(self, namespace):
+        urls = set()
+
+        def fetch_urls(ids):
+            res = self.index.fetch(ids=ids, namespace=namespace)
+            vectors = res.vectors if hasattr(res, 'vectors') else res.get('vectors', {})
+            page_urls = []
+            for vector in vectors.values():
+                metadata = vector.metadata if hasattr(vector, 'metadata') else vector.get('metadata')
+                if metadata and metadata.get('url'):
+                    page_urls.append(metadata['url'])
+            return page_urls
+
+        # index.list yields pages of record IDs; each page's fetch runs on a small pool while the
+        # next page is listed, with at most SCAN_FETCH_THREADS pages in flight
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=SCAN_FETCH_THREADS, thread_name_prefix="pinecone-scan") as pool:
+            for ids in self.index.list(namespace=namespace):
+                if not ids: continue
+                in_flight.append(pool.submit(fetch_urls, list(ids)))
+                if len(in_flight) >= SCAN_FETCH_THREADS:
+                    urls.update(in_flight.popleft().result())
+            while in_flight:
+                urls.update(in_flight.popleft().result())
+        return urls
+
+    def _person_record(self, person_data):
+        """Builds the Pinecone record for a scraped profile, or None if it has no URL / is already indexed."""
+        url = person_data.get('URL', '')
+        if not url: return None
+
+        name = f"{person_data.get('First Name', '')} {person_data.get('Last Name', '')}".strip()
+
+        # ID Structure: "broker-slugified-name"
+        record_id = f"broker-{slugify(name)}"
+        if record_id == "broker-unknown": record_id = f"broker-{slugify(url)}" # Fallback
+
+        # DUPLICATE CHECK (In specific namespace)
+        record_id = self._claim_url(url, PERSON_NAMESPACE, record_id, f"broker-{slugify(url)}")
+        if not record_id:
+            return None
+
+        # Structured Search Text (The "Brain")
+        title = person_data.get('Title', 'N/A')
+        specialties = person_data.get('Specialties', 'N/A')
+        # Extract keywords for searchable identity
+        # Layout: "Broker Name: [Name]. Specialty: [Specialties]. Role: [Title] at CBRE Seattle."
+        text_blob = f"Broker Name: {name}. Specialty: {specialties}. Role: {title} at CBRE Seattle."
+
+        # Metadata (Exact March Pilot Layout)
+        metadata = {
+            'type': 'person',
+            'full_name': name,
+            'phone_number': person_data.get('phone_number') or '',
+            'mobile_number': person_data.get('mobile_phoneNumber') or '',
+            'email': person_data.get('Email', ''),
+            'vcard_url': person_data.get('vCardURL', ''),
+            'specialty_tags': person_data.get('specialty_tags', []),
+            'bio': (person_data.get('bio_summary') or '')[:BIO_MAX_CHARS],
+            'url': url
+        }
+        # Integrated Inference v6/v7: Pass 'text' as field for llama-text-embed-v2
+        return {"_id": record_id, "text": clean_embedding_text(text_blob), **metadata}
 
     def upsert_person(self, person_data):
-        if not self.index:
-            return
+        """Queues a scraped profile for upsert (built and sent in batches off the caller's thread, see flush)."""
+        if self.index:
+            self._enqueue(PERSON_NAMESPACE, self._person_record, person_data)
+
+    def upsert_people_batch(self, people):
+        """Queues many scraped profiles for upsert."""
+        for person_data in people:
+            self.upsert_person(person_data)
+
+    def _property_record(self, prop_data):
+        """Builds the Pinecone record for a scraped property, or None if it has no URL / is already indexed."""
+        url = prop_data.get('URL', '')
+        if not url: return None
         
-        try:
-            url = person_data.get('URL', '')
-            if not url: return
-            
-            namespace = "seattle_directory"
-
-            # DUPLICATE CHECK (In specific namespace)
-            if self.exists(url, namespace=namespace):
-                print(f"    - Skipping (Already in Namespace {namespace}): {url}")
-                return
-
-            # Structured Search Text (The "Brain")
-            name = f"{person_data.get('First Name', '')} {person_data.get('Last Name', '')}".strip()
-            title = person_data.get('Title', 'N/A')
-            specialties = person_data.get('Specialties', 'N/A')
-            # Extract keywords for searchable identity
-            # Layout: "Broker Name: [Name]. Specialty: [Specialties]. Role: [Title] at CBRE Seattle."
-            text_blob = f"Broker Name: {name}. Specialty: {specialties}. Role: {title} at CBRE Seattle."
-            
-            # ID Structure: "broker-slugified-name"
-            record_id = f"broker-{slugify(name)}"
-            if record_id == "broker-unknown": record_id = f"broker-{slugify(url)}" # Fallback
-
-            # Metadata (Exact March Pilot Layout)
-            metadata = {
-                'type': 'person',
-                'full_name': name,
-                'phone_number': person_data.get('phone_number') or '',
-                'mobile_number': person_data.get('mobile_phoneNumber') or '',
-                'email': person_data.get('Email', ''),
-                'vcard_url': person_data.get('vCardURL', ''),
-                'specialty_tags': person_data.get('specialty_tags', []),
-                'bio': person_data.get('bio_summary', ''),
-                'url': url
-            }
-            
-            # Upsert (Integrated Inference v6/v7: Pass 'text' as field for llama-text-embed-v2)
-            self.index.upsert_records(
-                namespace=namespace,
-                records=[{
-                    "_id": record_id,
-                    "text": text_blob,
-                    **metadata
-                }]
-            )
-            logger.info(f"Successfully upserted person to {namespace}: {record_id}")
-            
-        except Exception as e:
-            print(f"Error upserting person: {e}")
+        namespace = PROPERTY_NAMESPACE
+
+        name = prop_data.get('Property Name', 'Unknown Property')
+
+        # ID Structure: "prop-slugified-name"
+        prop_id = prop_data.get('Property ID') or slugify(name)[:20]
+        record_id = f"prop-{prop_id}"
+
+        # DUPLICATE CHECK
+        record_id = self._claim_url(url, namespace, record_id, f"prop-{slugify(url)}")
+        if not record_id:
+            return None
+
+        address = prop_data.get('Address', '')
+        prop_type = prop_data.get('Type', 'Commercial space')
+        
+        # Record Layout: "Property: X. Address: Y. Type: Z."
+        text_blob = f"Property: {name}. Address: {address}. Type: {prop_type}."
+
+        # Primary Broker logic
+        # Only the first broker is indexed, so just read that one
+        brokers = prop_data.get('Brokers') or [{}]
+        primary_broker = brokers[0].get('Name', 'Not Listed')
+        broker_phone = brokers[0].get('phone_number', '')
+
+        # Metadata (Exact March Pilot Layout)
+        metadata = {
+            'type': 'property',
+            'address': address,
+            'brochure_url': prop_data.get('Brochure URL', 'Not Found'),
+            'primary_broker': primary_broker,
+            'broker_phone': broker_phone,
+            'sq_ft_range': prop_data.get('SqFt', 'N/A'),
+            'url': url
+        }
+        # Integrated Inference v6/v7
+        return {"_id": record_id, "text": clean_embedding_text(text_blob), **metadata}
 
     def upsert_property(self, prop_data):
-        if not self.index:
+        """Queues a scraped property for upsert (built and sent in batches off the caller's thread, see flush)."""
+        if self.index:
+            self._enqueue(PROPERTY_NAMESPACE, self._property_record, prop_data)
+
+    def _claim_url(self, url, namespace, record_id, fallback_id):
+        """
+        Returns the ID to upsert the URL under, or None if it is already indexed (or claimed by
+        another queued record). Marks the URL as taken.
+        """
+        with self._upsert_lock:
+            known = self._known_urls.get(namespace)
+            if known is not None:
+                taken = url in known
+                known.add(url)
+            else:
+                taken = None
+        if taken is None:
+            # Namespace not preloaded (or the listing failed): keyed lookup on the deterministic record ID
+            stored_url = self._stored_url(record_id, namespace)
+            if stored_url and stored_url != url:
+                # A different page (e.g. a namesake) holds this ID: key this one by its URL instead
+                record_id = fallback_id
+                stored_url = self._stored_url(record_id, namespace)
+            taken = stored_url == url
+        if taken:
+            print(f"    - Skipping (Already in Namespace {namespace}): {url}")
+            return None
+        return record_id
+
+    def _stored_url(self, record_id, namespace):
+        """Fetch-by-ID lookup: the 'url' stored on that record, or None if there is no such record."""
+        try:
+            res = self.index.fetch(ids=[record_id], namespace=namespace)
+            vectors = res.vectors if hasattr(res, 'vectors') else res.get('vectors', {})
+            vector = (vectors or {}).get(record_id)
+            if vector is None: return None
+            metadata = vector.metadata if hasattr(vector, 'metadata') else vector.get('metadata')
+            return (metadata or {}).get('url')
+        except Exception:
+            return None
+
+    def _enqueue(self, namespace, build, data):
+        """
+        Buffers scraped data with its record builder; a full batch is handed to the upload pool
+        right away. Scrapers only pay for an append: duplicate checks, record building and the
+        upsert itself all run on the pool.
+        """
+        with self._upsert_lock:
+            buffer = self._upsert_buffers.setdefault(namespace, [])
+            buffer.append((build, data))
+            if len(buffer) >= UPSERT_BATCH_SIZE:
+                self._upsert_buffers[namespace] = []
+                self._submit_upsert(namespace, buffer)
+
+    def _submit_upsert(self, namespace, items):
+        # Caller holds _upsert_lock
+        if self._upsert_pool is None:
+            self._upsert_pool = ThreadPoolExecutor(max_workers=UPSERT_THREADS, thread_name_prefix="pinecone-upsert")
+        self._pending_upserts.append(self._upsert_pool.submit(self._upsert_records, namespace, items))
+
+    def _upsert_records(self, namespace, items):
+        records = []
+        for build, data in items:
+            try:
+                record = build(data)
+            except Exception as e:
+                print(f"Error building record for {namespace}: {e}")
+                continue
+            if record:
+                records.append(record)
+        if not records:
             return
-            
         try:
-            url = prop_data.get('URL', '')
-            if not url: return
-            
-            namespace = "seattle_listings"
+            self.index.upsert_records(namespace=namespace, records=records)
+            logger.info(f"Successfully upserted {len(records)} records to {namespace}")
+        except Exception as e:
+            print(f"Error upserting {len(records)} records to {namespace}: {e}")
 
-            # DUPLICATE CHECK
-            if self.exists(url, namespace=namespace):
-                print(f"    - Skipping (Already in Namespace {namespace}): {url}")
-                return
+    def flush(self):
+        """Sends every buffered record and waits until all queued upserts have finished."""
+        with self._upsert_lock:
+            for namespace, buffer in self._upsert_buffers.items():
+                if buffer:
+                    self._submit_upsert(namespace, buffer)
+            self._upsert_buffers = {}
+            pending, self._pending_upserts = self._pending_upserts, []
+        for future in pending:
+            future.result()
 
-            name = prop_data.get('Property Name', 'Unknown Property')
-            address = prop_data.get('Address', '')
-            prop_type = prop_data.get('Type', 'Commercial space')
+    def _search_namespace(self, ns, query_text, top_k, filter_type):
+        """Runs one search_records call; returns [{id, metadata, score}] (empty on error)."""
+        matches = []
+        try:
+            # Construct query object for this namespace
+            # Use 'None' for filter if generic search, or specific type if we had one (though implied by namespace)
+            current_filter = {'type': filter_type} if filter_type else None 
             
-            # Record Layout: "Property: X. Address: Y. Type: Z."
-            text_blob = f"Property: {name}. Address: {address}. Type: {prop_type}."
+            # If generic search, we might optionally filter by type validation if we trust data purity,
+            # but typically just querying the namespace is enough.
+            # Let's be safe: if searching seattle_directory, filter by type='person' just in case data is mixed?
+            # Actually, data is siloed. Let's just trust namespace.
             
-            # ID Structure: "prop-slugified-name"
-            prop_id = prop_data.get('Property ID') or slugify(name)[:20]
-            record_id = f"prop-{prop_id}"
-
-            # Primary Broker logic
-            brokers = prop_data.get('Brokers', [])
-            primary_broker = brokers[0].get('Name', 'Not Listed') if brokers else "Not Listed"
-            broker_phone = brokers[0].get('phone_number', '') if brokers else ""
-
-            # Metadata (Exact March Pilot Layout)
-            metadata = {
-                'type': 'property',
-                'address': address,
-                'brochure_url': prop_data.get('Brochure URL', 'Not Found'),
-                'primary_broker': primary_broker,
-                'broker_phone': broker_phone,
-                'sq_ft_range': prop_data.get('SqFt', 'N/A'),
-                'url': url
-            }
+            query_obj = SearchQuery(
+                inputs={"text": query_text},
+                top_k=top_k,
+                filter=current_filter
+            )
             
-            # Upsert (Integrated Inference v6/v7)
-            self.index.upsert_records(
-                namespace=namespace,
-                records=[{
-                    "_id": record_id,
-                    "text": text_blob,
-                    **metadata
-                }]
+            results = self.index.search_records(
+                namespace=ns,
+                query=query_obj,
+                fields=SEARCH_FIELDS
             )
-            logger.info(f"Successfully upserted property to {namespace}: {record_id}")
+
+            # Extract hits
+            hits = []
+            if hasattr(results, 'result'): # v7 object style
+                hits = getattr(results.result, 'hits', [])
+            elif isinstance(results, dict):
+                if 'result' in results and 'hits' in results['result']:
+                    hits = results['result']['hits']
+                elif 'hits' in results:
+                    hits = results['hits']
             
-        except Exception as e:
-            print(f"Error upserting property: {e}")
+            if not hits and hasattr(results, 'hits'):
+                 hits = results.hits
+
+            for hit in hits:
+                # Hits are plain dicts or v7 objects; pick the accessor once per hit
+                get = hit.get if isinstance(hit, dict) else partial(getattr, hit)
+                matches.append({
+                    'id': get('_id', None),
+                    'metadata': get('fields', None) or {},
+                    'score': get('_score', None) or 0.0
+                })
+        except Exception as ns_err:
+             logger.error(f"Error querying namespace {ns}: {ns_err}")
+        return matches
 
     def search(self, query_text, top_k=3, filter_type=None):
         """
@@ -205,64 +436,28 @@ class VectorDB:
             # Determine Namespaces to Query
             namespaces_to_query = []
             if filter_type == 'person': 
-                namespaces_to_query = ["seattle_directory"]
+                namespaces_to_query = [PERSON_NAMESPACE]
             elif filter_type == 'property': 
-                namespaces_to_query = ["seattle_listings"]
+                namespaces_to_query = [PROPERTY_NAMESPACE]
             else: 
                 # Generic Search: Query both!
-                namespaces_to_query = ["seattle_directory", "seattle_listings"]
+                namespaces_to_query = [PERSON_NAMESPACE, PROPERTY_NAMESPACE]
             
-            all_matches = []
-
-            for ns in namespaces_to_query:
-                # logger.info(f"DEBUG: Querying namespace: {ns}")
-                try:
-                    # Construct query object for this namespace
-                    # Use 'None' for filter if generic search, or specific type if we had one (though implied by namespace)
-                    current_filter = {'type': filter_type} if filter_type else None 
-                    
-                    # If generic search, we might optionally filter by type validation if we trust data purity,
-                    # but typically just querying the namespace is enough.
-                    # Let's be safe: if searching seattle_directory, filter by type='person' just in case data is mixed?
-                    # Actually, data is siloed. Let's just trust namespace.
-                    
-                    query_obj = SearchQuery(
-                        inputs={"text": query_text},
-                        top_k=top_k,
-                        filter=current_filter
-                    )
-                    
-                    results = self.index.search_records(
-                        namespace=ns,
-                        query=query_obj
-                    )
-
-                    # Extract hits
-                    hits = []
-                    if hasattr(results, 'result'): # v7 object style
-                        hits = getattr(results.result, 'hits', [])
-                    elif isinstance(results, dict):
-                        if 'result' in results and 'hits' in results['result']:
-                            hits = results['result']['hits']
-                        elif 'hits' in results:
-                            hits = results['hits']
-                    
-                    if not hits and hasattr(results, 'hits'):
-                         hits = results.hits
-
-                    for hit in hits:
-                        _id = getattr(hit, '_id', None) or hit.get('_id')
-                        fields = getattr(hit, 'fields', {}) or hit.get('fields', {})
-                        score = getattr(hit, '_score', 0.0) or hit.get('_score', 0.0)
-                        
-                        all_matches.append({
-                            'id': _id,
-                            'metadata': fields,
-                            'score': score
-                        })
-                except Exception as ns_err:
-                     logger.error(f"Error querying namespace {ns}: {ns_err}")
-                     continue
+            if len(namespaces_to_query) == 1:
+                all_matches = self._search_namespace(namespaces_to_query[0], query_text, top_k, filter_type)
+            else:
+                # Generic search: query the namespaces concurrently, not one after the other. If the first
+                # to answer already fills top_k with strong hits, don't wait for the slower one.
+                all_matches = []
+                futures = [
+                    self._search_pool.submit(self._search_namespace, ns, query_text, top_k, filter_type)
+                    for ns in namespaces_to_query
+                ]
+                for fut in as_completed(futures):
+                    matches = fut.result()
+                    all_matches.extend(matches)
+                    if len(matches) >= top_k and all(m['score'] >= SEARCH_SHORTCUT_SCORE for m in matches[:top_k]):
+                        break
 
             # Sort combined results by score descending
             all_matches.sort(key=lambda x: x['score'], reverse=True)
@@ -281,7 +476,8 @@ class VectorDB:
                 md = m['metadata']
                 # score = m.score # Removed score check for now as we trust top_k or add it to match dict earlier
                 
-                if md.get('type') == 'person':
+                record_type = md.get('type')
+                if record_type == 'person':
                     # Structured Record Mapping
                     name = md.get('full_name')
                     
@@ -301,7 +497,7 @@ class VectorDB:
                         top_variables = {"target_phone": target, "vcard_url": vcard}
                     response_parts.append(part)
                     
-                elif md.get('type') == 'property':
+                elif record_type == 'property':
                     # Structured Record Mapping
                     addr = md.get('address')
                     brochure = md.get('brochure_url')
@@ -1,32 +1,40 @@
 import os
-from pinecone import Pinecone
+import argparse
 from dotenv import load_dotenv
+from crawler_app.pinecone_client import get_index
 
-env_path = os.path.join('cbre_ui', 'backend', '.env')
-load_dotenv(env_path)
+# Pinecone accepts at most 1000 IDs per delete request
+DELETE_BATCH_SIZE = 1000
 
-api_key = os.getenv("PINECONE_API_KEY")
-host = "https://cbre-5eba2yo.svc.aped-4627-b74a.pinecone.io"
+def parse_args():
+    parser = argparse.ArgumentParser(description="Delete records from the Pinecone index by ID")
+    parser.add_argument("--ns", action="append", required=True,
+                        help="Namespace for the matching --ids (repeatable), e.g. seattle_directory")
+    parser.add_argument("--ids", action="append", required=True,
+                        help="Comma-separated record IDs, e.g. broker-joe-riley,broker-jane-doe")
+    args = parser.parse_args()
+    if len(args.ns) != len(args.ids):
+        parser.error("each --ns needs exactly one --ids")
+    return args
 
-pc = Pinecone(api_key=api_key)
-index = pc.Index(host=host)
+def main():
+    args = parse_args()
+    load_dotenv(os.path.join('cbre_ui', 'backend', '.env'))
 
-# 1. Delete Person
-record_id = 'broker-joe-riley'
-namespace = 'seattle_directory'
-print(f"Deleting {record_id} from {namespace}...")
-try:
-    index.delete(ids=[record_id], namespace=namespace)
-    print("Deleted successfully.")
-except Exception as e:
-    print(f"Error deleting: {e}")
+    # Group IDs by namespace so each namespace is one request (per DELETE_BATCH_SIZE IDs)
+    by_ns = {}
+    for ns, ids in zip(args.ns, args.ids):
+        by_ns.setdefault(ns, []).extend(i.strip() for i in ids.split(',') if i.strip())
 
-# 2. Delete Property
-record_id_prop = 'prop-monte-villa-center-s'
-namespace_prop = 'seattle_listings'
-print(f"Deleting {record_id_prop} from {namespace_prop}...")
-try:
-    index.delete(ids=[record_id_prop], namespace=namespace_prop)
-    print("Deleted successfully.")
-except Exception as e:
-    print(f"Error deleting: {e}")
+    index = get_index()
+    for ns, ids in by_ns.items():
+        print(f"Deleting {len(ids)} record(s) from {ns}: {', '.join(ids)}")
+        try:
+            for i in range(0, len(ids), DELETE_BATCH_SIZE):
+                index.delete(ids=ids[i:i + DELETE_BATCH_SIZE], namespace=ns)
+            print("Deleted successfully.")
+        except Exception as e:
+            print(f"Error deleting: {e}")
+
+if __name__ == "__main__":
+    main()
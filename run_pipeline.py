@@ -3,39 +3,40 @@ import sys
 import os
 import uvicorn
 import json
-import time
+import contextlib
 from crawler_app.scraper import GenericCrawler
-from crawler_app.vector_db import VectorDB
+from crawler_app.vector_db import VectorDB, PERSON_NAMESPACE, PROPERTY_NAMESPACE
 
 def print_person_summary(p_data):
-    """Prints a clean summary of extracted person data."""
-    print(f"\n👤 [PERSON FOUND]")
-    print(f"NAME: {p_data.get('First Name', '')} {p_data.get('Last Name', '')}")
-    print(f"TITLE: {p_data.get('Title', 'N/A')}")
-    print(f"EMAIL: {p_data.get('Email', 'N/A')}")
-    
-    p_num = p_data.get('phone_number', 'N/A')
-    m_num = p_data.get('mobile_phoneNumber', 'N/A')
-    print(f"PHONE: {p_num}")
-    print(f"MOBILE: {m_num}")
-    
+    """Prints a clean summary of extracted person data (one write, so parallel output stays intact)."""
     loc = p_data.get('Full Address', 'N/A').replace('\n', ', ')
-    print(f"LOCATION: {loc}")
-    print(f"SPECIALTIES: {p_data.get('Specialties', 'N/A')}")
+    lines = [
+        "\n👤 [PERSON FOUND]",
+        f"NAME: {p_data.get('First Name', '')} {p_data.get('Last Name', '')}",
+        f"TITLE: {p_data.get('Title', 'N/A')}",
+        f"EMAIL: {p_data.get('Email', 'N/A')}",
+        f"PHONE: {p_data.get('phone_number', 'N/A')}",
+        f"MOBILE: {p_data.get('mobile_phoneNumber', 'N/A')}",
+        f"LOCATION: {loc}",
+        f"SPECIALTIES: {p_data.get('Specialties', 'N/A')}",
+    ]
     if p_data.get('Experience'):
-        print(f"EXPERIENCE: {p_data['Experience'][:200].strip()}...")
-    print(f"----------------------------------------\n")
+        lines.append(f"EXPERIENCE: {p_data['Experience'][:200].strip()}...")
+    lines.append("----------------------------------------\n")
+    print("\n".join(lines))
 
 def print_property_summary(p_data):
-    """Prints a clean summary of extracted property data."""
-    print(f"\n✅ [PROPERTY FOUND]")
-    print(f"PROPERTY NAME: {p_data.get('Property Name', 'N/A')}")
-    print(f"ADDRESS: {p_data.get('Address', 'N/A')}")
-    print(f"SQ FT: {p_data.get('SqFt', 'N/A')}")
-    print(f"BROCHURE URL: {p_data.get('Brochure URL', 'Not Found')}")
+    """Prints a clean summary of extracted property data (one write, so parallel output stays intact)."""
+    lines = [
+        "\n✅ [PROPERTY FOUND]",
+        f"PROPERTY NAME: {p_data.get('Property Name', 'N/A')}",
+        f"ADDRESS: {p_data.get('Address', 'N/A')}",
+        f"SQ FT: {p_data.get('SqFt', 'N/A')}",
+        f"BROCHURE URL: {p_data.get('Brochure URL', 'Not Found')}",
+    ]
     brokers = p_data.get('Brokers', [])
     if brokers:
-        print(f"CONNECTED AGENTS:")
+        lines.append("CONNECTED AGENTS:")
         for b in brokers:
             off = b.get('phone_number')
             mob = b.get('mobile_phoneNumber')
@@ -44,13 +45,58 @@ def print_property_summary(p_data):
             if off: contact_str += f" | 📞 Office: {off}"
             if mob: contact_str += f" | 📱 Mobile: {mob}"
             if e_list: contact_str += f" | ✉️ {', '.join(e_list)}"
-            print(contact_str)
+            lines.append(contact_str)
     else:
-        print(f"CONNECTED AGENTS: None found")
+        lines.append("CONNECTED AGENTS: None found")
     
     if p_data.get('Description'):
-        print(f"DESCRIPTION: {p_data['Description'][:300].strip()}...")
-    print(f"----------------------------------------\n")
+        lines.append(f"DESCRIPTION: {p_data['Description'][:300].strip()}...")
+    lines.append("----------------------------------------\n")
+    print("\n".join(lines))
+
+# URL fragments run_pipeline routes on (auto mode and directory detection)
+PERSON_MARKERS = ("/people/",)
+PROPERTY_MARKERS = ("/details/", "/properties/", "/listings/")
+PERSON_DIRECTORY_MARKERS = ("#", "?")
+PROPERTY_DIRECTORY_MARKERS = ("properties-for-lease", "properties-for-sale", "?")
+
+def detect_mode(url):
+    """'person', 'property' or None, guessed from the URL (for --mode auto)."""
+    if any(m in url for m in PERSON_MARKERS) and not url.endswith("/people"):
+        return 'person'
+    if any(m in url for m in PROPERTY_MARKERS):
+        return 'property'
+    return None
+
+def is_directory(url, mode):
+    """True if the URL is a directory/search page for `mode` rather than a single record. Details pages never are."""
+    if "/details/" in url:
+        return False
+    if mode == 'person':
+        return any(m in url for m in PERSON_DIRECTORY_MARKERS) or url.rstrip('/').endswith("/people")
+    return any(m in url for m in PROPERTY_DIRECTORY_MARKERS)
+
+def open_output(path):
+    """JSONL sink for scraped records (a no-op context if no path was given)."""
+    return open(path, 'a', encoding='utf-8') if path else contextlib.nullcontext()
+
+def load_done_urls(path):
+    """URLs of records already written to a JSONL output file; failed or unreachable scrapes aren't counted, so they're retried."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue # Partial last line from an interrupted run
+            failed = (any(str(record.get(k, '')).startswith("Error:") for k in ('Experience', 'Description'))
+                      or "SKIPPED (Unreachable)" in record.values())
+            if record.get('URL') and not failed:
+                done.add(record['URL'])
+    print(f"Resuming: {len(done)} URLs already in {path}.")
+    return done
 
 def main():
     parser = argparse.ArgumentParser(description="Run CBRE Scraper Pipeline")
@@ -59,8 +105,19 @@ def main():
     parser.add_argument("--mode", choices=['auto', 'person', 'property'], default='auto', help="Force specific scraper mode")
     parser.add_argument("--dry-run", action="store_true", help="Test mode: Do not save to Vector DB")
     parser.add_argument("--limit", type=int, default=None, help="Max items to process (for testing)")
+    parser.add_argument("--workers", "--max-concurrency", dest="workers", type=int, default=int(os.getenv("SCRAPE_WORKERS", "1")), help="Pages scraped in parallel for directory runs (one browser each; default $SCRAPE_WORKERS or 1)")
+    parser.add_argument("--rate-limit", type=float, default=2.0, help="Minimum seconds between page scrape starts (shared by all workers)")
+    parser.add_argument("--rate", type=float, default=None, help="Page scrapes started per second across all workers (overrides --rate-limit)")
+    parser.add_argument("--output", default=None, help="Append every scraped record from a directory run to this JSONL file as it finishes")
+    parser.add_argument("--resume", action="store_true", help="Skip URLs already recorded in --output by an earlier (possibly interrupted) run")
+    parser.add_argument("--cdp-endpoint", default=os.getenv("CHROMIUM_CDP_ENDPOINT"), help="Attach to a shared Chromium (started with --remote-debugging-port=9222) instead of launching one, e.g. http://127.0.0.1:9222")
     
     args = parser.parse_args()
+    if args.rate:
+        args.rate_limit = 1.0 / args.rate
+    if args.resume and not args.output:
+        parser.error("--resume needs --output")
+    done_urls = load_done_urls(args.output) if args.resume else set()
     
     print(f"Pipeline started for URL: {args.url}")
     print(f"Mode: {args.mode}")
@@ -68,7 +125,7 @@ def main():
     print(f"Dry Run: {args.dry_run}")
     
     # Initialize Crawler (Default to headed)
-    crawler = GenericCrawler(headless=args.hide_browser, disable_vectors=args.dry_run)
+    crawler = GenericCrawler.get_shared(headless=args.hide_browser, disable_vectors=args.dry_run, cdp_endpoint=args.cdp_endpoint)
     
     # Initialize Vector DB if keys exist and NOT dry run
     vdb = None
@@ -83,74 +140,53 @@ def main():
     
     try:
         # Determine mode logic
-        is_person = False
-        is_property = False
-        
-        if args.mode == 'person':
-            is_person = True
-        elif args.mode == 'property':
-            is_property = True
-        else:
-            # Auto-detection
-            if "/people/" in args.url and not args.url.endswith("/people"):
-                is_person = True
-            elif "/details/" in args.url: # Explicit details page
-                is_property = True
-            elif "/properties/" in args.url or "/listings/" in args.url:
-                is_property = True
-            else:
-                pass
+        mode = args.mode if args.mode != 'auto' else detect_mode(args.url)
 
-        if is_person:
+        if mode == 'person':
             # Check if it's a directory/search URL despite being in 'person' mode
-            # If it's a details page, it's never a directory
-            is_directory_url = (
-                "/details/" not in args.url and (
-                    "#" in args.url or 
-                    "?" in args.url or 
-                    args.url.rstrip('/').endswith("/people")
-                )
-            )
-            
-            if is_directory_url:
+            if is_directory(args.url, mode):
                 print("detected Person Directory/Search URL.")
                 print(f"Gathering profiles from: {args.url}")
                 
                 # Get list of profiles (Default selectors are for People)
                 results = crawler.get_links(args.url, limit=args.limit)
                 print(f"--- FOUND {len(results)} PROFILES ---")
-                
-                # Apply Limit logic used to be here, but now inside get_links too.
-                # Double check to be safe or if get_links limit didn't trigger.
-                if args.limit and len(results) > args.limit:
-                     results = results[:args.limit]
+
+                # Load known URLs once so the duplicate check below is local
+                crawler.preload_known(PERSON_NAMESPACE)
 
                 # Iterate and Scrape
-                all_data = []
+                todo = []
                 for i, res in enumerate(results):
                     profile_url = res.get('URL')
                     if not profile_url: continue
                     
                     print(f"[{i+1}/{len(results)}] Checking Profile: {res.get('Name')} ({profile_url})")
                     
-                    # PRE-SCRAPE DUPLICATE CHECK
-                    if vdb and vdb.exists(profile_url):
+                    # PRE-SCRAPE DUPLICATE CHECK (local checkpoint first, then the vector DB)
+                    if profile_url in done_urls:
+                        print(f"    - Skipping (Already in {args.output}): {profile_url}")
+                        continue
+                    if crawler.exists(profile_url, PERSON_NAMESPACE):
                         print(f"    - Skipping (Already in Vector DB): {profile_url}")
                         continue
+                    todo.append(profile_url)
+
+                # Parallel workers open their own browsers; a single worker keeps using the warm one
+                if args.workers > 1:
+                    crawler.close_browser()
+                # Records are streamed out as they finish instead of being held for the whole batch.
+                # closing() stops the workers (and closes their browsers) right away if we leave early on Ctrl+C or an error.
+                batch = crawler.scrape_details_batch(todo, concurrency=args.workers, delay=args.rate_limit)
+                with open_output(args.output) as out, contextlib.closing(batch):
+                    for profile_url, p_data in batch:
+                        if out:
+                            out.write(json.dumps(p_data) + "\n")
 
-                    try:
-                        p_data = crawler.scrape_details(profile_url, None, None)
-                        all_data.append(p_data)
-                        
                         # Detailed Key-Value Summary for UI
                         print_person_summary(p_data)
-                        
-                        time.sleep(2)
-                    except Exception as e:
-                        print(f"   > Error scraping profile: {e}")
                 
                 print("--- BATCH COMPLETE ---")
-                # print(json.dumps(all_data, indent=2))
                 
             else:
                 # Single Profile Mode
@@ -159,18 +195,9 @@ def main():
                 print("--- DATA EXTRACTED ---")
                 print_person_summary(data)
             
-        elif is_property:
+        elif mode == 'property':
              # Check for Property Directory
-             # If it's a details page, it's NEVER a directory
-             is_prop_directory = (
-                 "/details/" not in args.url and (
-                     "properties-for-lease" in args.url or 
-                     "properties-for-sale" in args.url or
-                     "?" in args.url
-                 )
-             )
-             
-             if is_prop_directory:
+             if is_directory(args.url, mode):
                  print("detected Property Directory/Search URL.")
                  print(f"Gathering properties from: {args.url}")
                  
@@ -186,35 +213,41 @@ def main():
                      limit=args.limit
                  )
                  print(f"--- FOUND {len(results)} PROPERTIES ---")
-                 
-                 if args.limit and len(results) > args.limit:
-                     results = results[:args.limit]
 
-                 all_data = []
+                 # Load known URLs once so the duplicate check below is local
+                 crawler.preload_known(PROPERTY_NAMESPACE)
+
+                 todo = []
                  for i, res in enumerate(results):
                      prop_url = res.get('URL')
                      if not prop_url: continue
                      
                      print(f"[{i+1}/{len(results)}] Checking Property: {res.get('Name')} ({prop_url})")
 
-                     # PRE-SCRAPE DUPLICATE CHECK
-                     if vdb and vdb.exists(prop_url):
+                     # PRE-SCRAPE DUPLICATE CHECK (local checkpoint first, then the vector DB)
+                     if prop_url in done_urls:
+                         print(f"    - Skipping (Already in {args.output}): {prop_url}")
+                         continue
+                     if crawler.exists(prop_url, PROPERTY_NAMESPACE):
                          print(f"    - Skipping (Already in Vector DB): {prop_url}")
                          continue
+                     todo.append(prop_url)
+
+                 # Parallel workers open their own browsers; a single worker keeps using the warm one
+                 if args.workers > 1:
+                     crawler.close_browser()
+                 # Records are streamed out as they finish instead of being held for the whole batch.
+                 # closing() stops the workers (and closes their browsers) right away if we leave early on Ctrl+C or an error.
+                 batch = crawler.scrape_property_batch(todo, concurrency=args.workers, delay=args.rate_limit)
+                 with open_output(args.output) as out, contextlib.closing(batch):
+                     for prop_url, p_data in batch:
+                         if out:
+                             out.write(json.dumps(p_data) + "\n")
 
-                     try:
-                         p_data = crawler.scrape_property(prop_url)
-                         all_data.append(p_data)
-                         
                          # Detailed Key-Value Summary for UI
                          print_property_summary(p_data)
-                         
-                         time.sleep(2)
-                     except Exception as e:
-                         print(f"   > Error scraping property: {e}")
 
                  print("--- BATCH COMPLETE ---")
-                 # print(json.dumps(all_data, indent=2)) # Reduced verbosity
 
              else:
                 print(f"Running Single Property Scraper: {args.url}")
@@ -244,7 +277,7 @@ def main():
             # If this is a directory, let's scrape the children up to the limit.
             
             for i, res in enumerate(results):
-                link = res.get('url') if isinstance(res, dict) else res
+                link = res.get('URL') if isinstance(res, dict) else res
                 if not link: continue
                 
                 print(f"[{i+1}/{len(results)}] Scraping child: {link}")
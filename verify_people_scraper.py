@@ -4,7 +4,7 @@ import sys
 
 def verify_joe_riley():
     # Initialize with headless=False to allow manual intervention if needed (Cloudflare)
-    crawler = GenericCrawler(headless=False)
+    crawler = GenericCrawler.get_shared(headless=False)
     
     try:
         url = "https://www.cbre.com/people/joe-riley"
@@ -1,26 +1,33 @@
 import os
+import functools
 from crawler_app.vector_db import VectorDB
 
-# Initialize VectorDB (it will load its own .env)
-db = VectorDB()
+@functools.cache
+def _db():
+    # Connect on first query, not at import (VectorDB loads its own .env)
+    return VectorDB()
 
 def test_query(query, filter_type=None):
     print(f"\n--- Testing Query: '{query}' (Filter: {filter_type}) ---")
-    res = db.search(query, filter_type=filter_type)
+    res = _db().search(query, filter_type=filter_type)
     print("Response Text:", res.get('text'))
     print("Variables:", res.get('variables'))
     return res
 
-# 1. Test Person Search
-test_query("Joe Riley", filter_type='person')
+def main():
+    # 1. Test Person Search
+    test_query("Joe Riley", filter_type='person')
 
-# 2. Test Property Search
-test_query("Monte Villa Center", filter_type='property')
+    # 2. Test Property Search
+    test_query("Monte Villa Center", filter_type='property')
 
-# 3. Test Generic Search (Should find Joe Riley in directory AND/OR Monte Villa in listings)
-print("\n--- Testing Universal Search (No Filter) ---")
-print("Searching for 'Joe'...")
-test_query("Joe")
+    # 3. Test Generic Search (Should find Joe Riley in directory AND/OR Monte Villa in listings)
+    print("\n--- Testing Universal Search (No Filter) ---")
+    print("Searching for 'Joe'...")
+    test_query("Joe")
 
-print("\nSearching for 'Monte'...")
-test_query("Monte")
+    print("\nSearching for 'Monte'...")
+    test_query("Monte")
+
+if __name__ == "__main__":
+    main()
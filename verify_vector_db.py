@@ -1,6 +1,5 @@
 import os
 import sys
-import json
 from crawler_app.vector_db import VectorDB
 
 # Mock env vars if not present for testing